@@ -1,9 +1,21 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
-import yaml
-import plotly.express as px
+
+from utils.artifacts import ArtifactRegistry, PAGE_ARTIFACTS
+from utils.comparison import comparison_frame, ranking_table
+from utils.forecast import recursive_forecast, FORECAST_END_YEAR
+from utils.intervals import predict_interval, DEFAULT_QUANTILES
+from utils.prediction_cache import PredictionCache
+from utils.preprocess import NOT_NUMERIC, OUT_OF_RANGE
+from utils.surrogate import serving_model
+from utils.scenarios import base_row, pct_sweep, run_scenarios, response_surface
+from utils import timing
+from utils.timing import span, timed
+
+# plotly.express, sklearn (via the pickled models) and joblib are imported
+# only by the pages and sections that use them, to keep cold starts short;
+# see python -m utils.import_profile
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -70,50 +82,129 @@ def set_background(image_url):
 # -------------------------------------------------
 # LOAD DATA
 # -------------------------------------------------
-@st.cache_data
-def load_forecast_df():
-    return pd.read_csv("dataset/forecast_dataset.csv")
-
 @st.cache_resource
-def load_pipeline():
-    return joblib.load("models/prediction/pred_pipeline.pkl")
+def get_registry():
+    # One registry per process, shared by every session
+    return ArtifactRegistry()
 
-@st.cache_resource
-def load_forecast_model():
-    return joblib.load("models/forecast/rf_forecast_model.pkl")
+registry = get_registry()
 
-@st.cache_resource
-def load_forecast_features():
-    return joblib.load("models/forecast/forecast_feature_columns.pkl")
+# Picks up artifacts republished in the manifest since the last rerun
+registry.refresh()
 
 @st.cache_resource
-def load_feature_columns():
-    return joblib.load("models/prediction/feature_columns.pkl")
+def get_prediction_cache():
+    # Shared by every session; keys include the pipeline's content hash
+    return PredictionCache()
 
-@st.cache_resource
-def load_prediction_metrics():
-    return joblib.load("models/prediction/prediction_metrics.pkl")
+@timed()
+def load_forecast_store():
+    return registry.get("forecast_store")
 
-@st.cache_resource
-def load_forecast_metrics():
-    return joblib.load("models/forecast/forecast_metrics.pkl")
-
-# -------------------------------------------------
-# LOAD EVERYTHING
-# -------------------------------------------------
-forecast_df = load_forecast_df()
+@timed()
+def load_pipeline():
+    # (model, cache key, mode served). config.yaml serving: prediction_mode
+    # picks the full model or the distilled surrogate; both are served from
+    # compact exports when current, which keeps sklearn and scipy out of
+    # the process
+    mode = load_config().get("serving", {}).get("prediction_mode", "full")
+    return serving_model(registry, mode)
+
+@timed()
+def load_forecast_model():
+    # (model, content hash), both from the same version
+    return registry.versioned("forecast_model")
 
-prediction_model = load_pipeline()
-forecast_model = load_forecast_model()
+@timed()
+def load_forecast_features():
+    # (feature list, content hash), both from the same version
+    return registry.versioned("forecast_features")
 
-feature_columns = load_feature_columns()
-forecast_features = load_forecast_features()
+@timed()
+def load_feature_columns():
+    return registry.get("feature_columns")
+
+@timed()
+def load_model_info(model):
+    # Version and metrics published in the manifest
+    return registry.model_info(model) or {"version": None, "metrics": {}}
+
+@timed()
+def load_backtest():
+    # (per-horizon, per-country) rolling-origin error tables, None when
+    # scripts/run_backtest has not been run
+    return registry.try_get("backtest_by_horizon"), registry.try_get("backtest_by_country")
+
+@timed()
+def load_precomputed_forecasts():
+    return registry.get("forecast_table")
+
+@timed()
+def load_attributions():
+    # Only served when computed from the current pipeline
+    table = registry.try_get("attributions")
+    if table is None or table.pipeline_hash != registry.content_hash("pipeline"):
+        return None
+    return table
+
+@timed()
+def load_input_schema():
+    return registry.get("input_schema")
+
+@timed()
+def load_config():
+    return registry.get("config")
+
+@timed()
+@st.cache_data
+def load_forecast_paths(_model, _df, _features, _encoding, inputs_version, end_year=FORECAST_END_YEAR):
+    # Full trajectory for every country, one batched predict per year
+    return recursive_forecast(
+        _model, _df, _features, end_year,
+        quantiles=DEFAULT_QUANTILES, encoding=_encoding
+    )
 
-prediction_metrics = load_prediction_metrics()
-forecast_metrics = load_forecast_metrics()
+def live_forecast_paths(forecast_store):
+    # (every country's live forecast path, version of the inputs behind it);
+    # the version covers every hot-reloadable input, not just the model
+    forecast_model, forecast_hash = load_forecast_model()
+    forecast_features, features_hash = load_forecast_features()
+    encoding, encoding_hash = registry.versioned("country_encoding")
+    store_hash = registry.versioned("forecast_store")[1]
+
+    inputs_version = ":".join(str(h) for h in [
+        forecast_hash, registry.content_hash("forecast_df"), store_hash, features_hash, encoding_hash,
+    ])
+    forecast_paths = load_forecast_paths(
+        forecast_model, forecast_store.frame, forecast_features, encoding, inputs_version
+    )
+    return forecast_paths, inputs_version
+
+def load_all_forecast_paths(forecast_store):
+    # (every country's forecast path, version of the inputs behind it)
+    forecast_table = load_precomputed_forecasts()
+    if forecast_table is not None:
+        return forecast_table.frame, forecast_table.content_hash
+
+    return live_forecast_paths(forecast_store)
+
+@st.cache_data(max_entries=64)
+def comparison_view(_history, _paths, version, year):
+    # Figure payload and ranking per (forecast version, year), so reruns
+    # and view toggles never rebuild them
+    import plotly.express as px
+
+    fig = px.line(
+        comparison_frame(_history, _paths, year),
+        x="Year",
+        y="Food Insecurity Rate",
+        color="Country_orig",
+        line_dash="Series",
+        title=f"ASEAN Forecast to {year}",
+        labels={"Country_orig": "Country"},
+    )
+    return fig.to_dict(), ranking_table(_history, _paths, year)
 
-with open("config.yaml") as f:
-    config = yaml.safe_load(f)
 # -------------------------------------------------
 # TABLEAU
 # -------------------------------------------------
@@ -144,18 +235,22 @@ nav = st.radio(
     label_visibility="collapsed"
 )
 
-# =================================================
-# HOME
-# =================================================
-if nav == "Home":
+timing.start_rerun(page=nav)
+
+try:
+
+    # =================================================
+    # HOME
+    # =================================================
+    if nav == "Home":
 
-    set_background("https://i.pinimg.com/1200x/a3/3c/96/a33c968a4561111e2b4ce37a8d7d3617.jpg")
+        set_background("https://i.pinimg.com/1200x/a3/3c/96/a33c968a4561111e2b4ce37a8d7d3617.jpg")
 
 
-    # =====================================
-    # SECTION 1 : MAIN TITLE (NO IMAGE)
-    # =====================================
-    st.markdown("""
+        # =====================================
+        # SECTION 1 : MAIN TITLE (NO IMAGE)
+        # =====================================
+        st.markdown("""
     <div style="
         padding:120px 20px;
         text-align:center;
@@ -212,18 +307,18 @@ if nav == "Home":
     </div>
     """, unsafe_allow_html=True)
 
-    st.markdown("""
+        st.markdown("""
     <style>
     html {
         scroll-behavior: smooth;
     }
     </style>
     """, unsafe_allow_html=True)
-    # =====================================
-    # SECTION 2 : ABOUT PROJECT
-    # IMAGE + 40% DARK OVERLAY
-    # =====================================
-    st.markdown("""
+        # =====================================
+        # SECTION 2 : ABOUT PROJECT
+        # IMAGE + 40% DARK OVERLAY
+        # =====================================
+        st.markdown("""
     <div id="about_project"></div>
     <div style="
         width:100vw;
@@ -309,11 +404,11 @@ if nav == "Home":
 
 
 
-    # =====================================
-    # SECTION 3 : PROBLEM STATEMENT
-    # DARK BACKGROUND
-    # =====================================
-    st.markdown("""
+        # =====================================
+        # SECTION 3 : PROBLEM STATEMENT
+        # DARK BACKGROUND
+        # =====================================
+        st.markdown("""
     <div id="problem_statement"></div>
     <div style="
         width:100vw;
@@ -357,22 +452,22 @@ if nav == "Home":
     </div>
     """, unsafe_allow_html=True)
 
-# =================================================
-# DASHBOARD
-# =================================================
-elif nav == "Dashboard":
+    # =================================================
+    # DASHBOARD
+    # =================================================
+    elif nav == "Dashboard":
 
-    set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
+        set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
 
-    st.title("Food Security Dashboard")
-    embed_tableau(TABLEAU_PATHS["Overview"])
+        st.title("Food Security Dashboard")
+        embed_tableau(TABLEAU_PATHS["Overview"])
 
-# =================================================
-# ML PREDICTION
-# =================================================
-elif nav == "ML Prediction":
+    # =================================================
+    # ML PREDICTION
+    # =================================================
+    elif nav == "ML Prediction":
 
-    st.markdown("""
+        st.markdown("""
 <style>
 
 /* MAIN DASHBOARD CONTAINER */
@@ -413,90 +508,208 @@ elif nav == "ML Prediction":
 </style>
 """, unsafe_allow_html=True)
 
-    set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
+        set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
 
-    st.title("🍚 Food Insecurity Prediction")
+        st.title("🍚 Food Insecurity Prediction")
 
-    with st.container(key="main_container"):
+        config = load_config()
+        feature_columns = load_feature_columns()
+        input_schema = load_input_schema()
 
-        sidebar, main_page = st.columns([1,2])
+        with st.container(key="main_container"):
 
-        # =========================
-        # SIDEBAR
-        # =========================
-        with sidebar:
-            with st.container(key="sidebar"):
+            sidebar, main_page = st.columns([1,2])
 
-                st.image("https://i.pinimg.com/736x/f6/44/2c/f6442c7bc0e8c5c76c70d63dda6e65bb.jpg")
-                st.write("Fill details below to predict food insecurity")
+            # =========================
+            # SIDEBAR
+            # =========================
+            with sidebar:
+                with st.container(key="sidebar"):
 
-                user_inputs = {}
-                errors = False
+                    st.image("https://i.pinimg.com/736x/f6/44/2c/f6442c7bc0e8c5c76c70d63dda6e65bb.jpg")
+                    st.write("Fill details below to predict food insecurity")
 
-                for feature in feature_columns:
+                    raw_inputs = {}
+                    field_errors = {}
 
-                    value = st.text_input(feature)
+                    for feature in feature_columns:
+                        raw_inputs[feature] = st.text_input(feature)
+                        field_errors[feature] = st.empty()
 
-                    if value != "":
-                        try:
-                            user_inputs[feature] = float(value)
-                        except ValueError:
-                            st.error(f"⚠️ '{feature}' must be numeric.")
-                            errors = True
-                    else:
-                        user_inputs[feature] = None
+                    # All fields checked in one vectorized pass
+                    validation = input_schema.validate(raw_inputs)
 
-                predict_button = st.button("Predict Production")
+                    for feature, problem in validation.row_errors(0):
+                        if problem == "not numeric":
+                            field_errors[feature].error(f"⚠️ '{feature}' must be numeric.")
+                        elif problem == "out of range":
+                            low, high = input_schema.bounds(feature)
+                            field_errors[feature].error(
+                                f"⚠️ '{feature}' is outside the plausible range {low:,.2f} – {high:,.2f}."
+                            )
 
-        # =========================
-        # MAIN PAGE
-        # =========================
-        with main_page:
-            with st.container(key="mainpanel"):
+                    errors = validation.flagged(NOT_NUMERIC | OUT_OF_RANGE).any()
 
-                st.subheader("Prediction Model Info")
-                st.write("Algorithm:", config["model"]["algorithm_pred"])
-                st.write("R square score:", config["model"]["r_square_score"])
-                st.write("RMSE:", config["model"]["rmse"])
-                st.write("Average CV Score:", config["model"]["avg_CV_score"])
+                    predict_button = st.button("Predict Production")
 
-                result_placeholder = st.empty()
+            # =========================
+            # MAIN PAGE
+            # =========================
+            with main_page:
+                with st.container(key="mainpanel"):
 
-                if predict_button:
-                    try:
+                    st.subheader("Prediction Model Info")
+                    model_info = load_model_info("prediction")
+                    metrics = model_info["metrics"]
 
-                        if errors:
-                            st.warning("Please correct invalid inputs.")
+                    st.write("Algorithm:", config["model"]["algorithm_pred"])
+                    st.write("Version:", model_info["version"])
+                    st.write("R square score:", round(metrics.get("r_square_score", float("nan")), 2))
+                    st.write("RMSE:", round(metrics.get("rmse", float("nan")), 2))
+                    st.write("Average CV Score:", round(metrics.get("avg_CV_score", float("nan")), 2))
 
-                        elif any(v is None for v in user_inputs.values()):
-                            st.warning("Please fill all fields.")
+                    result_placeholder = st.empty()
 
-                        else:
+                    if predict_button:
+                        try:
+
+                            if errors:
+                                st.warning("Please correct invalid inputs.")
+
+                            elif not validation.valid[0]:
+                                st.warning("Please fill all fields.")
+
+                            else:
+
+                                input_df = validation.frame()
 
-                            input_df = pd.DataFrame([user_inputs])
-                            input_df = input_df[feature_columns]
+                                prediction_model, model_key, served_mode = load_pipeline()
 
-                            prediction = prediction_model.predict(input_df)[0]
+                                with span("predict"):
+                                    prediction = get_prediction_cache().predict(
+                                        prediction_model,
+                                        model_key,
+                                        input_df
+                                    )[0]
 
-                            result_placeholder.markdown(
-                                f"""
+                                # The surrogate only mimics the mean; the range
+                                # needs the full forest's per-tree spread
+                                if served_mode == "full":
+                                    with span("predict_interval"):
+                                        interval = predict_interval(
+                                            prediction_model, input_df, DEFAULT_QUANTILES, n_jobs=1
+                                        ).iloc[0]
+                                    detail = f"90% range: {interval['q05']:,.2f} – {interval['q95']:,.2f}"
+                                else:
+                                    detail = "Surrogate model"
+
+                                result_placeholder.markdown(
+                                    f"""
                                 <div class="result-card">
                                 🌾 Food Insecurity Rate:<br><br>
-                                <b>{prediction:,.2f}</b>
+                                <b>{prediction:,.2f}</b><br>
+                                <span style="font-size:16px;">{detail}</span>
                                 </div>
                                 """,
-                                unsafe_allow_html=True
-                            )
+                                    unsafe_allow_html=True
+                                )
+
+                        except ValueError:
+                            result_placeholder.error("Invalid numeric input.")
 
-                    except ValueError:
-                        result_placeholder.error("Invalid numeric input.")
+                    # =========================
+                    # PREDICTION DRIVERS
+                    # =========================
+                    with st.expander("Prediction drivers"):
 
-# =================================================
-# ML FORECASTING
-# =================================================
-elif nav == "ML Forecasting":
+                        attributions = load_attributions()
+                        forecast_store = load_forecast_store()
 
-    st.markdown("""
+                        if attributions is None:
+                            st.write("Attributions have not been built for the current model.")
+                        else:
+                            driver_country = st.selectbox("Country", forecast_store.countries, key="driver_country")
+                            driver_years = forecast_store.country(driver_country)["Year"].tolist()
+                            driver_year = st.selectbox("Year", driver_years, index=len(driver_years) - 1, key="driver_year")
+
+                            explanation = attributions.lookup(driver_country, driver_year)
+
+                            if explanation is not None:
+                                st.write(
+                                    f"Predicted {explanation['prediction']:.2f} "
+                                    f"(average {explanation['base_value']:.2f})"
+                                )
+
+                                drivers = explanation["drivers"].head(10)[::-1]
+
+                                import plotly.express as px
+
+                                st.plotly_chart(px.bar(
+                                    x=drivers.to_numpy(),
+                                    y=drivers.index,
+                                    orientation="h",
+                                    labels={"x": "Contribution", "y": ""}
+                                ))
+
+                    # =========================
+                    # WHAT-IF SCENARIOS
+                    # =========================
+                    with st.expander("What-if scenarios"):
+
+                        forecast_store = load_forecast_store()
+
+                        scenario_country = st.selectbox("Base country", forecast_store.countries, key="scenario_country")
+                        country_years = forecast_store.country(scenario_country)["Year"].tolist()
+                        scenario_year = st.selectbox("Base year", country_years, index=len(country_years) - 1)
+
+                        swept = st.multiselect("Indicators to vary (up to 2)", feature_columns, max_selections=2)
+
+                        sweeps = []
+                        for feature in swept:
+                            low, high = st.slider(f"{feature} change (%)", -50, 50, (-10, 10), key=f"sweep_{feature}")
+                            sweeps.append(pct_sweep(feature, low / 100, high / 100, 41))
+
+                        if sweeps and st.button("Run Scenarios"):
+
+                            with span("scenarios"):
+                                base = base_row(forecast_store, scenario_country, scenario_year, feature_columns)
+                                result = run_scenarios(load_pipeline()[0], base, sweeps, feature_columns)
+
+                            summary = result["summary"]
+                            st.write(
+                                f"{summary['scenarios']:,} scenarios · baseline {result['baseline']:.2f} · "
+                                f"range {summary['min']:.2f} – {summary['max']:.2f} · median {summary['p50']:.2f}"
+                            )
+
+                            import plotly.express as px
+
+                            if len(sweeps) == 1:
+                                curve = result["marginals"][swept[0]]
+                                fig = px.line(
+                                    curve.assign(change=curve["value"] * 100),
+                                    x="change",
+                                    y="mean",
+                                    labels={"change": f"{swept[0]} change (%)", "mean": "Food Insecurity Rate"}
+                                )
+                            else:
+                                surface = response_surface(result, sweeps, swept[0], swept[1])
+                                fig = px.imshow(
+                                    surface.to_numpy(),
+                                    x=surface.columns * 100,
+                                    y=surface.index * 100,
+                                    origin="lower",
+                                    aspect="auto",
+                                    labels={"x": f"{swept[0]} (%)", "y": f"{swept[1]} (%)", "color": "Rate"}
+                                )
+
+                            st.plotly_chart(fig)
+
+    # =================================================
+    # ML FORECASTING
+    # =================================================
+    elif nav == "ML Forecasting":
+
+        st.markdown("""
 <style>
 
 /* MAIN DASHBOARD CONTAINER */
@@ -537,27 +750,30 @@ elif nav == "ML Forecasting":
 </style>
 """, unsafe_allow_html=True)
 
-    set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
+        set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
+
+        st.title("📈 Food Insecurity Forecast")
 
-    st.title("📈 Food Insecurity Forecast")
+        config = load_config()
+        forecast_store = load_forecast_store()
 
-    with st.container(key="main_container"):
+        with st.container(key="main_container"):
 
-        sidebar, main_page = st.columns([1,2])
+            sidebar, main_page = st.columns([1,2])
 
-        # =========================
-        # SIDEBAR
-        # =========================
-        with sidebar:
-            with st.container(key="sidebar"):
+            # =========================
+            # SIDEBAR
+            # =========================
+            with sidebar:
+                with st.container(key="sidebar"):
             
 
-                st.image("https://i.pinimg.com/736x/dc/e4/e8/dce4e86cb51475d4fc0771acd2c3bdc4.jpg")
-                st.write("Fill details below to forecast food insecurity rate")
+                    st.image("https://i.pinimg.com/736x/dc/e4/e8/dce4e86cb51475d4fc0771acd2c3bdc4.jpg")
+                    st.write("Fill details below to forecast food insecurity rate")
                 
-                countries = sorted(forecast_df["Country_orig"].unique())
+                    countries = forecast_store.countries
 
-                st.markdown("""
+                    st.markdown("""
 <style>
 div[data-baseweb="select"] > div {
 background-color: #c9ae85 !important;
@@ -566,104 +782,158 @@ color: white !important;
 </style>
 """, unsafe_allow_html=True)
 
-                country = st.selectbox("Select Country", countries)
-                future_year = st.slider("Forecast Year", 2024, 2035)
+                    view = st.radio("View", ["Single country", "All countries"], horizontal=True)
+
+                    if view == "Single country":
+                        country = st.selectbox("Select Country", countries)
+                    else:
+                        country = None
+
+                    future_year = st.slider("Forecast Year", 2024, 2035)
 
-                forecast_button = st.button("Generate Forecast")
+                    forecast_button = view == "Single country" and st.button("Generate Forecast")
 
-        # =========================
-        # MAIN PANEL
-        # =========================
-        with main_page:
-            with st.container(key="mainpanel"):
+            # =========================
+            # MAIN PANEL
+            # =========================
+            with main_page:
+                with st.container(key="mainpanel"):
 
-                st.subheader("Forecasting Model Info")
+                    st.subheader("Forecasting Model Info")
 
-                st.write("Algorithm:", config["model"]["algorithm_forecast"])
-                st.write("MAE:", config["model"]["MAE"])
-                st.write("RMSE:", config["model"]["rmse_forecast"])
-                st.write("MAPE:", config["model"]["MAPE"])
+                    model_info = load_model_info("forecast")
+                    metrics = model_info["metrics"]
+                    by_horizon, by_country = load_backtest()
 
-                result_placeholder = st.empty()
+                    # Backtest errors one year ahead replace the single holdout
+                    # metrics when the tables exist
+                    if by_horizon is not None:
+                        metrics = by_horizon[by_horizon["horizon"] == 1].iloc[0].to_dict()
 
-                if forecast_button:
+                    st.write("Algorithm:", config["model"]["algorithm_forecast"])
+                    st.write("Version:", model_info["version"])
+                    st.write("MAE:", round(metrics.get("MAE", float("nan")), 2))
+                    st.write("RMSE:", round(metrics.get("RMSE", float("nan")), 2))
+                    st.write("MAPE:", round(metrics.get("MAPE", float("nan")), 2))
 
-                    country_data = forecast_df[forecast_df["Country_orig"] == country]
+                    if by_horizon is not None:
+                        with st.expander("Backtest errors by horizon"):
+                            st.caption("Rolling-origin backtest: one model per cutoff year, forecasting up to five years ahead.")
+                            st.dataframe(by_horizon.round(2), hide_index=True)
 
-                    if len(country_data) < 2:
-                        st.error("Not enough historical data for forecasting.")
-                        st.stop()
+                            if by_country is not None and country is not None:
+                                st.write(f"{country}:")
+                                st.dataframe(
+                                    by_country[by_country["Country_orig"] == country]
+                                    .drop(columns="Country_orig")
+                                    .round(2),
+                                    hide_index=True,
+                                )
 
-                    last_row = country_data.iloc[-1]
-                    prev_row = country_data.iloc[-2]
+                    result_placeholder = st.empty()
 
-                    lag1 = last_row["Food Insecurity Rate"]
-                    lag2 = prev_row["Food Insecurity Rate"]
+                    if view == "All countries":
 
-                    water_lag1 = last_row["water access"]
-                    water_lag2 = prev_row["water access"]
+                        try:
+                            forecast_paths, forecast_version = load_all_forecast_paths(forecast_store)
+                        except FileNotFoundError:
+                            st.error("Forecast model is not available.")
+                            st.stop()
+
+                        with span("comparison"):
+                            fig, ranking = comparison_view(
+                                forecast_store.frame, forecast_paths, forecast_version, future_year
+                            )
 
-                    rolling_mean = country_data["Food Insecurity Rate"].tail(3).mean()
+                        st.subheader(f"Regional Comparison, {future_year}")
+                        st.plotly_chart(fig)
+                        st.dataframe(ranking.round(2), hide_index=True)
 
-                    time_index = future_year - forecast_df["Year"].min()
+                    if forecast_button:
 
-                    input_data = pd.DataFrame(0, index=[0], columns=forecast_features)
+                        with span("forecast_filter"):
+                            country_data = forecast_store.country(country)
 
-                    input_data["Food Insecurity Rate_lag1"] = lag1
-                    input_data["Food Insecurity Rate_lag2"] = lag2
-                    input_data["water access_lag1"] = water_lag1
-                    input_data["water access_lag2"] = water_lag2
-                    input_data["food_insecurity_roll3"] = rolling_mean
-                    input_data["time_index"] = time_index
-                    input_data["water access"] = last_row["water access"]
+                        if len(country_data) < 2:
+                            st.error("Not enough historical data for forecasting.")
+                            st.stop()
 
-                    country_col = f"Country_orig_{country}"
+                        forecast_table = load_precomputed_forecasts()
 
-                    if country_col in input_data.columns:
-                        input_data[country_col] = 1
+                        if forecast_table is not None:
+                            with span("forecast_lookup"):
+                                country_path = forecast_table.path(country, future_year)
+                        else:
+                            try:
+                                forecast_paths, _ = live_forecast_paths(forecast_store)
+                            except FileNotFoundError:
+                                st.error("Forecast model is not available.")
+                                st.stop()
 
-                    prediction = forecast_model.predict(input_data)[0]
+                            country_path = forecast_paths[
+                                (forecast_paths["Country_orig"] == country)
+                                & (forecast_paths["Year"] <= future_year)
+                            ]
 
-                    st.subheader("Forecast Result")
+                        prediction = country_path["Food Insecurity Rate"].iloc[-1]
 
-                    st.success(
-                        f"Forecast Food Insecurity Rate: {prediction:.2f}"
-                    )
+                        st.subheader("Forecast Result")
 
-                    chart_df = country_data[["Year","Food Insecurity Rate"]].copy()
+                        st.success(
+                            f"Forecast Food Insecurity Rate: {prediction:.2f}"
+                        )
 
-                    forecast_point = pd.DataFrame({
-                        "Year":[future_year],
-                        "Food Insecurity Rate":[prediction]
-                    })
+                        if "q05" in country_path.columns:
+                            st.write(
+                                f"90% range: {country_path['q05'].iloc[-1]:.2f} – "
+                                f"{country_path['q95'].iloc[-1]:.2f}"
+                            )
 
-                    chart_df = pd.concat([chart_df, forecast_point])
+                        with span("chart"):
+                            chart_df = pd.concat([
+                                country_data[["Year","Food Insecurity Rate"]].assign(Series="Historical"),
+                                country_data[["Year","Food Insecurity Rate"]].tail(1).assign(Series="Forecast"),
+                                country_path[["Year","Food Insecurity Rate"]].assign(Series="Forecast"),
+                            ])
+
+                            import plotly.express as px
+
+                            fig = px.line(
+                                chart_df,
+                                x="Year",
+                                y="Food Insecurity Rate",
+                                color="Series",
+                                title=f"{country} Forecast"
+                            )
 
-                    fig = px.line(
-                        chart_df,
-                        x="Year",
-                        y="Food Insecurity Rate",
-                        title=f"{country} Forecast"
-                    )
+                            if "q05" in country_path.columns:
+                                fig.add_scatter(
+                                    x=pd.concat([country_path["Year"], country_path["Year"][::-1]]),
+                                    y=pd.concat([country_path["q95"], country_path["q05"][::-1]]),
+                                    fill="toself",
+                                    line={"width": 0},
+                                    opacity=0.25,
+                                    name="90% range"
+                                )
 
-                    st.plotly_chart(fig)
+                        st.plotly_chart(fig)
 
-# =================================================
-# METHODOLOGY
-# =================================================
-elif nav == "Methodology":
+    # =================================================
+    # METHODOLOGY
+    # =================================================
+    elif nav == "Methodology":
 
-    set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
+        set_background("https://i.pinimg.com/1200x/d3/d9/ef/d3d9efe6cad4c42f9538ec5ed8517946.jpg")
 
-    st.title("Project Methodology")
+        st.title("Project Methodology")
 
-    with st.container(horizontal_alignment="center"):
-        st.image("assets/methodology.png", width=800)
+        with st.container(horizontal_alignment="center"):
+            st.image("assets/methodology.png", width=800)
 
-# -------------------------------------------------
-# FOOTER
-# -------------------------------------------------
-footer_html = """
+    # -------------------------------------------------
+    # FOOTER
+    # -------------------------------------------------
+    footer_html = """
 <style>
 
 .footer {
@@ -723,4 +993,48 @@ Built with Data & Passion | © 2026 Jenifer M Jues
 </div>
 """
 
-st.markdown(footer_html, unsafe_allow_html=True)
+    st.markdown(footer_html, unsafe_allow_html=True)
+
+    # -------------------------------------------------
+    # DIAGNOSTICS (FOOD_TIMING=1 and ?diagnostics=1)
+    # -------------------------------------------------
+    if timing.ENABLED and st.query_params.get("diagnostics") == "1":
+
+        with st.expander("Diagnostics"):
+
+            history = timing.latency_history()
+
+            if not history:
+                st.write("No timing spans recorded yet.")
+            else:
+                summary = pd.DataFrame([
+                    {
+                        "span": name,
+                        "count": len(values),
+                        "p50 (ms)": np.percentile(values, 50),
+                        "p99 (ms)": np.percentile(values, 99),
+                    }
+                    for name, values in sorted(history.items())
+                ])
+                st.dataframe(summary, hide_index=True)
+                st.write("Prediction cache:", get_prediction_cache().stats())
+
+                selected_span = st.selectbox("Span", summary["span"])
+
+                import plotly.express as px
+
+                st.plotly_chart(px.histogram(
+                    pd.DataFrame({"ms": history[selected_span]}),
+                    x="ms",
+                    nbins=40,
+                    title=f"{selected_span} latency"
+                ))
+
+finally:
+    # Runs however the rerun ends, including st.stop() and exceptions
+    timing.end_rerun()
+
+# -------------------------------------------------
+# WARM REMAINING ARTIFACTS AFTER FIRST PAINT
+# -------------------------------------------------
+registry.warm(sorted({name for names in PAGE_ARTIFACTS.values() for name in names}))
@@ -0,0 +1,346 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import ARTIFACTS
+from utils.features import load_country_encoding
+from utils.forecast import recursive_forecast
+from utils.import_profile import PAGE_IMPORTS, page_probe, run_probe
+from utils.preprocess import load_schema, preprocess_input
+
+DATASET_PATH = "dataset/forecast_dataset.csv"
+RESULTS_PATH = "benchmarks/results.json"
+BASELINE_PATH = "benchmarks/baseline.json"
+
+# A benchmark regresses when its p50 grows by more than this fraction
+# and by more than MIN_DELTA_MS, so noise on sub-millisecond timings
+# cannot fail the run
+DEFAULT_THRESHOLD = 0.25
+MIN_DELTA_MS = 2.0
+
+BATCH_SIZE = 1000
+
+# p50 cold-start budgets (fresh interpreter importing what the dashboard
+# needs), in ms; exceeding one fails the run regardless of the baseline
+STARTUP_BUDGETS_MS = {
+    "startup": 2000,
+    "ML Prediction": 2500,
+    "ML Forecasting": 2500,
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+class Skip(Exception):
+    pass
+
+
+# ==========================
+# TIMING HELPERS
+# ==========================
+def time_calls(fn, repeats, warmup=1):
+    for _ in range(warmup):
+        fn()
+
+    samples = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples[i] = time.perf_counter() - start
+
+    return samples
+
+
+def summarize(samples, **extra):
+    ms = np.asarray(samples) * 1000
+    return {
+        "n": len(ms),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+        **extra,
+    }
+
+
+# ==========================
+# SYNTHETIC INPUTS
+# ==========================
+def synthetic_rows(feature_columns, n_rows, seed=0):
+    # Resample real rows and jitter each feature by 5% of its spread
+    df = pd.read_csv(DATASET_PATH, usecols=feature_columns)
+    rng = np.random.default_rng(seed)
+
+    sample = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    noise = rng.normal(0, 0.05, size=sample.shape) * df.std().to_numpy()
+
+    return (sample + noise)[feature_columns]
+
+
+# ==========================
+# BENCHMARKS
+# ==========================
+LOAD_PROBE = """
+import sys, time
+import joblib, pandas, yaml, sklearn.ensemble, sklearn.pipeline, sklearn.preprocessing
+from utils.artifacts import ARTIFACTS
+path, loader = ARTIFACTS[sys.argv[1]]
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    loader(path)
+    print(time.perf_counter() - start)
+"""
+
+
+@benchmark("artifact_load")
+def bench_artifact_load(repeats):
+    # One fresh interpreter per artifact, loading it `repeats` times, with
+    # imports excluded from the timing
+    results = {}
+    for name, (path, _) in ARTIFACTS.items():
+        if not os.path.exists(path):
+            results[name] = {"skipped": f"{path} not found"}
+            continue
+
+        out = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", LOAD_PROBE, name, str(repeats)],
+            capture_output=True, text=True, check=True,
+        )
+        samples = [float(line) for line in out.stdout.strip().splitlines()[-repeats:]]
+
+        # The first load also pays for imports done inside the loader
+        results[name] = summarize(samples, first_ms=samples[0] * 1000, size_mb=os.path.getsize(path) / 1e6)
+    return results
+
+
+@benchmark("cold_start")
+def bench_cold_start(repeats):
+    # Process start, then each page's artifacts and render-time imports
+    results = {}
+    for page in [None, *PAGE_IMPORTS]:
+        name = page or "startup"
+        code = page_probe(page)
+        samples = [run_probe(code) for _ in range(5)]
+        results[name] = summarize(samples, budget_ms=STARTUP_BUDGETS_MS[name])
+    return results
+
+
+@benchmark("prediction")
+def bench_prediction(repeats):
+    model = joblib.load(ARTIFACTS["pipeline"][0])
+    feature_columns = joblib.load(ARTIFACTS["feature_columns"][0])
+    X = synthetic_rows(feature_columns, BATCH_SIZE)
+    row = X.iloc[:1]
+
+    single = time_calls(lambda: model.predict(row), repeats)
+    batch = time_calls(lambda: model.predict(X), max(5, repeats // 10))
+
+    return {
+        "single_row": summarize(single),
+        f"batch_{BATCH_SIZE}": summarize(batch, rows_per_sec=float(BATCH_SIZE / np.median(batch))),
+    }
+
+
+@benchmark("forecast")
+def bench_forecast(repeats):
+    model_path = ARTIFACTS["forecast_model"][0]
+    if not os.path.exists(model_path):
+        raise Skip(f"{model_path} not found")
+
+    model = joblib.load(model_path)
+    forecast_features = joblib.load(ARTIFACTS["forecast_features"][0])
+    encoding = load_country_encoding(ARTIFACTS["country_encoding"][0])
+    df = pd.read_csv(DATASET_PATH)
+    next_year = int(df["Year"].max()) + 1
+
+    one_step = time_calls(
+        lambda: recursive_forecast(model, df, forecast_features, next_year, encoding=encoding), max(5, repeats // 10)
+    )
+    full = time_calls(
+        lambda: recursive_forecast(model, df, forecast_features, encoding=encoding), max(3, repeats // 20)
+    )
+
+    return {
+        "all_countries_one_step": summarize(one_step),
+        "all_countries_full_horizon": summarize(full),
+    }
+
+
+@benchmark("preprocess_input")
+def bench_preprocess(repeats):
+    feature_columns = joblib.load(ARTIFACTS["feature_columns"][0])
+    rows = synthetic_rows(feature_columns, repeats).to_dict("records")
+    rows_iter = iter(rows * 2)
+
+    samples = time_calls(lambda: preprocess_input(next(rows_iter)), repeats)
+    return summarize(samples, calls_per_sec=float(1 / np.median(samples)))
+
+
+@benchmark("validate_batch")
+def bench_validate(repeats):
+    schema = load_schema()
+    X = synthetic_rows(schema.columns, BATCH_SIZE * 100)
+    as_text = X.head(BATCH_SIZE).astype(str)
+
+    numeric = time_calls(lambda: schema.validate(X), max(5, repeats // 20))
+    text = time_calls(lambda: schema.validate(as_text), max(5, repeats // 10))
+
+    return {
+        f"numeric_{BATCH_SIZE * 100}": summarize(numeric, rows_per_sec=float(len(X) / np.median(numeric))),
+        f"text_{BATCH_SIZE}": summarize(text, rows_per_sec=float(len(as_text) / np.median(text))),
+    }
+
+
+# ==========================
+# BASELINE COMPARISON
+# ==========================
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and ("p50_ms" in value or "skipped" in value):
+            flat[name] = value
+        elif isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+    return flat
+
+
+def compare(results, baseline, threshold, min_delta_ms=MIN_DELTA_MS):
+    """One row per benchmark in either run.
+
+    Benchmarks that are skipped or absent on one side cannot be compared;
+    their rows have a "missing" reason instead of a ratio.
+    """
+    current = flatten(results)
+    previous = flatten(baseline)
+
+    # A skipped benchmark is one entry; a run of it has one per case
+    groups = {name.split(".")[0] for name in current}
+    dropped = [name for name in previous if name not in current and name not in groups]
+
+    rows = []
+    for name in [*current, *dropped]:
+        stats = current.get(name, {})
+        base = previous.get(name) or previous.get(name.split(".")[0], {})
+        row = {
+            "benchmark": name,
+            "baseline_p50_ms": base.get("p50_ms"),
+            "p50_ms": stats.get("p50_ms"),
+            "ratio": None,
+            "regression": False,
+            "missing": None,
+        }
+        if "p50_ms" not in stats:
+            row["missing"] = stats.get("skipped", "not run")
+        elif "p50_ms" not in base:
+            row["missing"] = "no baseline entry" + (f" (skipped: {base['skipped']})" if "skipped" in base else "")
+        else:
+            row["ratio"] = stats["p50_ms"] / base["p50_ms"]
+            delta_ms = stats["p50_ms"] - base["p50_ms"]
+            row["regression"] = delta_ms > min_delta_ms and row["ratio"] > 1 + threshold
+        rows.append(row)
+    return rows
+
+
+def over_budget(results):
+    return [
+        (name, stats)
+        for name, stats in flatten(results).items()
+        if "budget_ms" in stats and stats["p50_ms"] > stats["budget_ms"]
+    ]
+
+
+def run(names, repeats):
+    results = {}
+    for name in names:
+        try:
+            results[name] = BENCHMARKS[name](repeats)
+        except Skip as e:
+            results[name] = {"skipped": str(e)}
+        print(f"{name}: done")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the load, prediction and forecast hot paths.")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="Smallest p50 increase that can count as a regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    results = run(names, args.repeats)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    budget_failures = over_budget(results)
+    for name, stats in budget_failures:
+        print(f"{name:55s} p50 {stats['p50_ms']:10.3f} ms exceeds budget {stats['budget_ms']} ms OVER BUDGET")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {args.baseline}")
+        return 1 if budget_failures else 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 1 if budget_failures else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    baseline_results = {name: value for name, value in baseline["results"].items() if name in names}
+    rows = compare(results, baseline_results, args.threshold, args.min_delta_ms)
+    for row in rows:
+        if row["missing"] is not None:
+            print(f"{row['benchmark']:55s} NOT COMPARED: {row['missing']}")
+            continue
+        flag = "REGRESSION" if row["regression"] else "ok"
+        print(
+            f"{row['benchmark']:55s} {row['baseline_p50_ms']:10.3f} -> {row['p50_ms']:10.3f} ms "
+            f"(x{row['ratio']:.2f}) {flag}"
+        )
+
+    missing = [row for row in rows if row["missing"] is not None]
+    if missing:
+        print(f"WARNING: {len(missing)} benchmark(s) not compared against the baseline; "
+              "run with --update-baseline once every artifact is present.")
+
+    return 1 if budget_failures or any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import argparse
+import pickle
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from utils.features import (
+    COUNTRY,
+    build_training_matrix,
+    fit_country_encoding,
+    one_hot_features,
+    target_encoded_features,
+)
+from utils.forecast import recursive_forecast
+
+COUNTRY_COUNTS = [10, 50, 200]
+
+
+# ==========================
+# SYNTHETIC COUNTRIES
+# ==========================
+def synthetic_panel(df, n_countries, seed=0):
+    # Each synthetic country is a real country's series with its indicators
+    # and target scaled by a random factor plus 5% noise
+    rng = np.random.default_rng(seed)
+    sources = [g for _, g in df.groupby(COUNTRY, sort=True, observed=True)]
+    numeric = [c for c in df.select_dtypes("number").columns if c != "Year"]
+
+    panels = []
+    for i in range(n_countries):
+        country = sources[i % len(sources)].copy()
+        scale = rng.uniform(0.7, 1.3)
+        noise = rng.normal(1, 0.05, size=(len(country), len(numeric)))
+        country[numeric] = country[numeric].to_numpy() * scale * noise
+        country[COUNTRY] = f"Synthetic {i:03d}"
+        country["Country"] = country[COUNTRY]
+        panels.append(country)
+
+    return pd.concat(panels, ignore_index=True)
+
+
+# ==========================
+# ONE CONFIGURATION
+# ==========================
+def run_one(df, base_features, encoding_name, n_trees):
+    if encoding_name == "target":
+        features = target_encoded_features(base_features)
+        encoding = fit_country_encoding(df)
+    else:
+        features = one_hot_features(base_features, df[COUNTRY].unique())
+        encoding = None
+
+    start = time.perf_counter()
+    X, y, _ = build_training_matrix(df, features, encoding=encoding)
+    build_s = time.perf_counter() - start
+
+    model = RandomForestRegressor(n_estimators=n_trees, random_state=42, n_jobs=-1)
+    start = time.perf_counter()
+    model.fit(pd.DataFrame(X, columns=features), y)
+    fit_s = time.perf_counter() - start
+
+    model.set_params(n_jobs=1)
+
+    start = time.perf_counter()
+    recursive_forecast(model, df, features, int(df["Year"].max()) + 5, encoding=encoding)
+    all_s = time.perf_counter() - start
+
+    one_country = df[COUNTRY].iloc[0]
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        recursive_forecast(model, df, features, int(df["Year"].max()) + 5, [one_country], encoding=encoding)
+        samples.append(time.perf_counter() - start)
+
+    return {
+        "encoding": encoding_name,
+        "features": len(features),
+        "matrix_mb": X.nbytes / 1e6,
+        "build_ms": build_s * 1000,
+        "fit_s": fit_s,
+        "tree_nodes": sum(e.tree_.node_count for e in model.estimators_),
+        "model_mb": len(pickle.dumps(model)) / 1e6,
+        "forecast_all_ms": all_s * 1000,
+        "forecast_one_ms": float(np.median(samples)) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare one-hot and target-encoded countries at scale.")
+    parser.add_argument("--countries", type=int, nargs="*", default=COUNTRY_COUNTS)
+    parser.add_argument("--trees", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv("dataset/forecast_dataset.csv")
+    base_features = joblib.load("models/forecast/forecast_feature_columns.pkl")
+
+    rows = []
+    for n_countries in args.countries:
+        panel = synthetic_panel(df, n_countries)
+        for encoding_name in ("onehot", "target"):
+            result = run_one(panel, base_features, encoding_name, args.trees)
+            rows.append({"countries": n_countries, "rows": len(panel), **result})
+            print(f"{n_countries} countries, {encoding_name}: done")
+
+    report = pd.DataFrame(rows)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(report.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
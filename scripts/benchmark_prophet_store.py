@@ -0,0 +1,83 @@
+import argparse
+import os
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from scripts.train_forecast_models import FORECASTS_PATH
+from utils.prophet_store import STORE_COLUMNS, load_prophet_store, write_prophet_store
+
+
+def best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def dir_size(paths):
+    return sum(os.path.getsize(p) for p in paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-country Prophet pickles with the compact store.")
+    parser.add_argument("--forecasts", default=FORECASTS_PATH, help="Wide forecasts from train_forecast_models")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.forecasts):
+        raise SystemExit(f"{args.forecasts} not found; run python -m scripts.train_forecast_models first.")
+
+    forecasts = pd.read_parquet(args.forecasts).reset_index()
+    countries = sorted(forecasts["Country"].unique())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # ==========================
+        # PREVIOUS LAYOUT: ONE PICKLE PER COUNTRY
+        # ==========================
+        pickle_paths = []
+        for country, country_df in forecasts.groupby("Country", sort=True):
+            path = os.path.join(tmp, f"{country}_prophet.pkl")
+            joblib.dump(country_df.drop(columns="Country").reset_index(drop=True), path)
+            pickle_paths.append(path)
+
+        store_path = os.path.join(tmp, "prophet_store.arrow")
+        write_prophet_store(forecasts, store_path)
+
+        # ==========================
+        # CHECK OUTPUTS
+        # ==========================
+        store = load_prophet_store(store_path)
+        for country, path in zip(countries, pickle_paths):
+            expected = joblib.load(path)
+            for column in STORE_COLUMNS:
+                if not np.array_equal(expected[column].to_numpy(), store.country(country)[column]):
+                    raise SystemExit(f"Compact store differs from pickles for {country} ({column}).")
+
+        # ==========================
+        # LOAD ALL COUNTRIES
+        # ==========================
+        def load_pickles():
+            return {c: joblib.load(p)[STORE_COLUMNS] for c, p in zip(countries, pickle_paths)}
+
+        def load_store():
+            s = load_prophet_store(store_path)
+            return {c: s.country(c) for c in s.countries}
+
+        results = [
+            ("pickles", dir_size(pickle_paths), best_of(load_pickles, args.repeats)),
+            ("compact", dir_size([store_path]), best_of(load_store, args.repeats)),
+        ]
+
+    print(f"{len(countries)} countries, {len(forecasts)} rows")
+    for kind, size, seconds in results:
+        print(f"{kind:8s} size {size / 1e3:8.1f} KB  load all {seconds * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
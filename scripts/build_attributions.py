@@ -0,0 +1,31 @@
+import time
+
+import joblib
+import pandas as pd
+
+from utils.artifacts import file_hash
+from utils.attributions import ATTRIBUTIONS_PATH, build_attribution_table, write_attribution_table
+
+PIPELINE_PATH = "models/prediction/pred_pipeline.pkl"
+
+# ==========================
+# LOAD DATA + MODEL
+# ==========================
+df = pd.read_csv("dataset/forecast_dataset.csv")
+pipeline = joblib.load(PIPELINE_PATH)
+feature_columns = joblib.load("models/prediction/feature_columns.pkl")
+
+# ==========================
+# ATTRIBUTIONS FOR EVERY ROW
+# ==========================
+start = time.perf_counter()
+table = build_attribution_table(pipeline, df, feature_columns)
+
+print(f"Computed attributions for {len(table)} rows in {time.perf_counter() - start:.1f}s")
+
+# ==========================
+# SAVE TABLE
+# ==========================
+write_attribution_table(table, file_hash(PIPELINE_PATH), ATTRIBUTIONS_PATH)
+
+print("Attributions saved to", ATTRIBUTIONS_PATH)
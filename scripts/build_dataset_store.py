@@ -0,0 +1,8 @@
+from utils.dataset_store import DATASET_CSV_PATH, DATASET_STORE_PATH, build_dataset_store
+
+# ==========================
+# CSV -> COLUMNAR STORE
+# ==========================
+df = build_dataset_store(DATASET_CSV_PATH, DATASET_STORE_PATH)
+
+print(f"Dataset store saved to {DATASET_STORE_PATH}: {len(df)} rows, {df['Country_orig'].nunique()} countries")
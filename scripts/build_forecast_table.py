@@ -0,0 +1,36 @@
+import joblib
+
+from utils.dataset_store import load_dataset_store
+from utils.features import load_country_encoding
+from utils.forecast import recursive_forecast, FORECAST_END_YEAR
+from utils.intervals import DEFAULT_QUANTILES
+from utils.forecast_table import (
+    FORECAST_INPUTS,
+    FORECAST_TABLE_PATH,
+    inputs_hash,
+    write_forecast_table,
+)
+
+# ==========================
+# LOAD DATA + MODEL
+# ==========================
+# The same Parquet store the dashboard serves
+df = load_dataset_store().frame
+model = joblib.load("models/forecast/rf_forecast_model.pkl")
+forecast_features = joblib.load("models/forecast/forecast_feature_columns.pkl")
+encoding = load_country_encoding()
+
+# ==========================
+# FORECAST EVERY COUNTRY / YEAR
+# ==========================
+forecast = recursive_forecast(
+    model, df, forecast_features, FORECAST_END_YEAR, quantiles=DEFAULT_QUANTILES, encoding=encoding
+)
+
+# ==========================
+# SAVE TABLE
+# ==========================
+content_hash = inputs_hash(FORECAST_INPUTS)
+write_forecast_table(forecast, content_hash, FORECAST_TABLE_PATH)
+
+print(f"Forecast table saved: {len(forecast)} rows, inputs hash {content_hash[:12]}")
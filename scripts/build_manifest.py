@@ -0,0 +1,24 @@
+import joblib
+
+from utils.artifacts import ARTIFACTS, file_hash
+from utils.manifest import MANIFEST_PATH, build_manifest, write_manifest
+
+# ==========================
+# HASH ARTIFACTS + COLLECT METRICS
+# ==========================
+manifest = build_manifest(ARTIFACTS, file_hash, joblib.load)
+
+# ==========================
+# PUBLISH
+# ==========================
+# A running dashboard picks up the artifacts whose hashes changed
+write_manifest(manifest, MANIFEST_PATH)
+
+for name, entry in sorted(manifest["artifacts"].items()):
+    print(f"{name:20s} {entry['sha256'][:12]}  {entry['path']}")
+
+for model, info in manifest["models"].items():
+    metrics = ", ".join(f"{k}={v:.3f}" for k, v in info["metrics"].items())
+    print(f"{model} model version {info['version']}: {metrics}")
+
+print("Manifest saved to", MANIFEST_PATH)
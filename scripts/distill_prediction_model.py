@@ -0,0 +1,73 @@
+import argparse
+import json
+
+import joblib
+import pandas as pd
+
+from utils.artifacts import file_hash, load_yaml
+from utils.compact_forest import COMPACT_FOREST_PATH, export_compact_forest, load_compact_forest
+from utils.preprocess import read_schema
+from utils.surrogate import (
+    CANDIDATES,
+    MAX_RMSE,
+    SURROGATE_PATH,
+    SURROGATE_REPORT_PATH,
+    distill,
+)
+
+PIPELINE_PATH = "models/prediction/pred_pipeline.pkl"
+TARGET = "Food Insecurity Rate"
+
+
+def main(argv=None):
+    config = load_yaml("config.yaml")
+    default_rmse = config.get("distill", {}).get("max_rmse", MAX_RMSE)
+
+    parser = argparse.ArgumentParser(description="Distill the prediction pipeline into a smaller surrogate.")
+    parser.add_argument("--max-rmse", type=float, default=default_rmse,
+                        help="Largest RMSE against the full model a surrogate may have")
+    parser.add_argument("--samples", type=int, default=30_000)
+    parser.add_argument("--candidates", nargs="*", choices=sorted(CANDIDATES), default=None)
+    args = parser.parse_args(argv)
+
+    # ==========================
+    # LOAD FULL MODEL
+    # ==========================
+    pipeline = joblib.load(PIPELINE_PATH)
+    pipeline_hash = file_hash(PIPELINE_PATH)
+    feature_columns = list(joblib.load("models/prediction/feature_columns.pkl"))
+
+    # The full model is scored through its compact export, as served
+    if load_compact_forest(COMPACT_FOREST_PATH).source_hash != pipeline_hash:
+        raise SystemExit("pred_forest.bin is stale; run python -m scripts.export_compact_forest first.")
+
+    df = pd.read_csv("dataset/forecast_dataset.csv")
+
+    # ==========================
+    # DISTILL
+    # ==========================
+    rows, best = distill(
+        pipeline, COMPACT_FOREST_PATH, df[feature_columns], df[TARGET].to_numpy(), feature_columns,
+        schema=read_schema(), n_samples=args.samples, candidates=args.candidates, max_rmse=args.max_rmse,
+    )
+
+    report = pd.DataFrame(rows)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(report.round(4).to_string(index=False))
+
+    # ==========================
+    # EXPORT + REPORT
+    # ==========================
+    with open(SURROGATE_REPORT_PATH, "w") as f:
+        json.dump({"max_rmse": args.max_rmse, "source_sha256": pipeline_hash, "models": rows}, f, indent=2)
+    print("Report saved to", SURROGATE_REPORT_PATH)
+
+    if best is None:
+        raise SystemExit(f"No surrogate within RMSE {args.max_rmse} of the full model; nothing exported.")
+
+    export_compact_forest(best, SURROGATE_PATH, feature_names=feature_columns, source_hash=pipeline_hash)
+    print("Surrogate saved to", SURROGATE_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import file_hash
+from utils.compact_forest import COMPACT_FOREST_PATH, export_compact_forest, load_compact_forest
+
+PIPELINE_PATH = "models/prediction/pred_pipeline.pkl"
+
+# Loads one artifact in a fresh interpreter and reports wall time and RSS growth
+LOAD_PROBE = """
+import sys, time
+import numpy, joblib
+import sklearn.ensemble, sklearn.pipeline, sklearn.preprocessing
+from utils.artifacts import file_hash
+from utils.compact_forest import load_compact_forest
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+before = rss_mb()
+start = time.perf_counter()
+if sys.argv[1] == "joblib":
+    joblib.load(sys.argv[2])
+else:
+    load_compact_forest(sys.argv[2])
+print(time.perf_counter() - start, rss_mb() - before)
+"""
+
+
+def measure_load(kind, path):
+    out = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", LOAD_PROBE, kind, path],
+        capture_output=True, text=True, check=True,
+    )
+    seconds, rss = map(float, out.stdout.split())
+    return seconds, rss
+
+
+# ==========================
+# EXPORT
+# ==========================
+pipeline = joblib.load(PIPELINE_PATH)
+feature_columns = joblib.load("models/prediction/feature_columns.pkl")
+
+export_compact_forest(
+    pipeline, COMPACT_FOREST_PATH, feature_names=feature_columns, source_hash=file_hash(PIPELINE_PATH)
+)
+compact = load_compact_forest(COMPACT_FOREST_PATH)
+
+# ==========================
+# CHECK OUTPUTS
+# ==========================
+X = pd.read_csv("dataset/forecast_dataset.csv")[feature_columns]
+max_diff = np.abs(pipeline.predict(X) - compact.predict(X)).max()
+
+print("Max abs difference vs pipeline:", max_diff)
+if not np.allclose(pipeline.predict(X), compact.predict(X), rtol=1e-9, atol=1e-9):
+    raise SystemExit("Compact forest does not match the pipeline.")
+
+# ==========================
+# LOAD TIME + MEMORY
+# ==========================
+for kind, path in [("joblib", PIPELINE_PATH), ("compact", COMPACT_FOREST_PATH)]:
+    seconds, rss = measure_load(kind, path)
+    size_mb = os.path.getsize(path) / 1e6
+    print(f"{kind:8s} size {size_mb:6.2f} MB  load {seconds * 1000:8.2f} ms  RSS +{rss:6.2f} MB")
+
+print("Compact forest saved to", COMPACT_FOREST_PATH)
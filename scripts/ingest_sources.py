@@ -0,0 +1,59 @@
+import argparse
+import os
+import resource
+import time
+
+from utils.ingest import (
+    CHUNK_ROWS,
+    INGEST_CACHE_DIR,
+    SOURCES_PATH,
+    build_datasets,
+    ingest,
+    load_spec,
+)
+
+TARGET = "Food Insecurity Rate"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the training datasets from FAO/World Bank bulk files.")
+    parser.add_argument("--spec", default=SOURCES_PATH)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--cache-dir", default=INGEST_CACHE_DIR)
+    parser.add_argument("--model-output", default="dataset/model_df.parquet")
+    parser.add_argument("--predict-output", default="dataset/predict_df.parquet")
+    parser.add_argument("--force", action="store_true", help="Re-read every source")
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    features = [column for column in spec["columns"] if column != TARGET]
+
+    # ==========================
+    # STREAM SOURCES
+    # ==========================
+    start = time.perf_counter()
+    panel, stats = ingest(spec, args.cache_dir, args.chunk_rows, args.force)
+
+    print(stats.round(2).to_string(index=False))
+    print(f"Ingest took {time.perf_counter() - start:.1f}s, "
+          f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    outputs = [args.model_output, args.predict_output]
+    if stats["cached"].all() and all(os.path.exists(path) for path in outputs):
+        print("All sources unchanged; datasets are up to date.")
+        return
+
+    # ==========================
+    # SAVE DATASETS
+    # ==========================
+    model_df, predict_df = build_datasets(panel, features, TARGET)
+
+    model_df.to_parquet(args.model_output, index=False)
+    predict_df.to_parquet(args.predict_output, index=False)
+
+    print(f"{len(model_df)} country-years saved to {args.model_output}")
+    print(f"{len(predict_df)} complete rows saved to {args.predict_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import time
+
+import joblib
+import pandas as pd
+
+from utils.backtest import (
+    BACKTEST_CACHE_DIR,
+    MAX_HORIZON,
+    MIN_TRAIN_YEARS,
+    cutoff_years,
+    run_backtest,
+    write_tables,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the forecast model.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--min-train-years", type=int, default=MIN_TRAIN_YEARS)
+    parser.add_argument("--max-horizon", type=int, default=MAX_HORIZON)
+    parser.add_argument("--no-cache", action="store_true", help="Refit every fold")
+    args = parser.parse_args(argv)
+
+    # ==========================
+    # LOAD DATA
+    # ==========================
+    df = pd.read_csv("dataset/forecast_dataset.csv")
+    forecast_features = joblib.load("models/forecast/forecast_feature_columns.pkl")
+
+    cutoffs = cutoff_years(df, args.min_train_years)
+
+    # ==========================
+    # RUN FOLDS
+    # ==========================
+    start = time.perf_counter()
+    errors, folds = run_backtest(
+        df, forecast_features, cutoffs, args.workers,
+        max_horizon=args.max_horizon,
+        cache_dir=None if args.no_cache else BACKTEST_CACHE_DIR,
+    )
+    wall = time.perf_counter() - start
+
+    print(folds.round(2).to_string(index=False))
+    print(f"{len(folds)} folds ({folds['cached'].sum()} cached) in {wall:.1f}s")
+
+    # ==========================
+    # SAVE ERROR TABLES
+    # ==========================
+    by_horizon, _ = write_tables(errors)
+
+    print(by_horizon.round(3).to_string(index=False))
+    print("Backtest tables saved to models/forecast/")
+
+
+if __name__ == "__main__":
+    main()
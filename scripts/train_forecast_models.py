@@ -1,26 +1,31 @@
-import pandas as pd
-import joblib
+import argparse
+import logging
 import os
-from prophet import Prophet
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-# ==========================
-# LOAD DATA
-# ==========================
-df = pd.read_csv("dataset/model_df.csv")
+import numpy as np
+import pandas as pd
+
+from utils.ingest import read_dataset
+from utils.prophet_store import PROPHET_STORE_PATH, write_prophet_store
+
+FORECASTS_PATH = "models/forecast/prophet_forecasts.parquet"
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+log = logging.getLogger("train_forecast_models")
 
-# Ensure folder exists
-os.makedirs("models/forecast", exist_ok=True)
 
 # ==========================
-# GET COUNTRY LIST
+# TRAIN ONE COUNTRY
 # ==========================
-countries = df["Country"].unique()
-
-for country in countries:
+def fit_country(country, country_df, periods=5):
+    from prophet import Prophet
 
-    print(f"Training Prophet model for {country}...")
+    # Prophet/cmdstanpy log every fit at INFO
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
 
-    country_df = df[df["Country"] == country].copy()
+    start = time.perf_counter()
 
     # Prepare time series
     ts = country_df[["Year", "Food Insecurity Rate"]].copy()
@@ -30,9 +35,6 @@ for country in countries:
     # Sort by date (IMPORTANT)
     ts = ts.sort_values("ds")
 
-    # ==========================
-    # TRAIN PROPHET
-    # ==========================
     model = Prophet(
         yearly_seasonality=False,
         weekly_seasonality=False,
@@ -44,15 +46,75 @@ for country in countries:
     # ==========================
     # FORECAST 5 YEARS
     # ==========================
-    future = model.make_future_dataframe(periods=5, freq="YS")
+    future = model.make_future_dataframe(periods=periods, freq="YS")
     forecast = model.predict(future)
+    forecast.insert(0, "Country", country)
+
+    return country, forecast, time.perf_counter() - start
+
+
+# ==========================
+# TRAIN ALL COUNTRIES
+# ==========================
+def train_all(df, workers=None, periods=5):
+    # One split up front instead of a boolean mask per country
+    groups = [(country, country_df) for country, country_df in df.groupby("Country", sort=True)]
 
-    # Save forecast dataframe (NOT model)
-    joblib.dump(forecast, f"models/forecast/{country}_prophet.pkl")
+    forecasts = []
+    fit_times = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fit_country, country, country_df, periods) for country, country_df in groups]
+
+        for future in futures:
+            country, forecast, seconds = future.result()
+            log.info("Trained Prophet model for %s in %.2fs", country, seconds)
+            forecasts.append(forecast)
+            fit_times[country] = seconds
+
+    forecasts = pd.concat(forecasts, ignore_index=True)
+    return forecasts.set_index(["Country", "ds"]).sort_index(), fit_times
+
+
+def log_fit_stats(fit_times, wall_seconds):
+    times = np.array(list(fit_times.values()))
+    log.info(
+        "Fit time per country: min %.2fs, median %.2fs, p95 %.2fs, max %.2fs (sum %.2fs, wall %.2fs)",
+        times.min(), np.median(times), np.percentile(times, 95), times.max(), times.sum(), wall_seconds,
+    )
+    slowest = max(fit_times, key=fit_times.get)
+    log.info("Slowest country: %s (%.2fs)", slowest, fit_times[slowest])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train one Prophet model per country in parallel.")
+    parser.add_argument("--data", default="dataset/model_df.parquet")
+    parser.add_argument("--output", default=FORECASTS_PATH)
+    parser.add_argument("--store", default=PROPHET_STORE_PATH, help="Compact ds/yhat/interval store")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--periods", type=int, default=5, help="Years to forecast past the last observation")
+    args = parser.parse_args(argv)
 
     # ==========================
-    # SAVE FORECAST
+    # LOAD DATA
     # ==========================
-    joblib.dump(forecast, f"models/forecast/{country}_prophet.pkl")
+    df = read_dataset(args.data)
+
+    # Ensure folder exists
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+
+    start = time.perf_counter()
+    forecasts, fit_times = train_all(df, args.workers, args.periods)
+    log_fit_stats(fit_times, time.perf_counter() - start)
+
+    # ==========================
+    # SAVE FORECASTS
+    # ==========================
+    forecasts.to_parquet(args.output)
+    write_prophet_store(forecasts, args.store)
+
+    print(f"Forecasts for {len(fit_times)} countries saved to {args.output} and {args.store}")
+
 
-print("All forecast models saved successfully.")
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,21 @@
+import argparse
+import itertools
+import pickle
+import time
+
+import numpy as np
 import pandas as pd
 import joblib
+from joblib import Parallel, delayed
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
 
-# ==========================
-# LOAD DATA
-# ==========================
-df = pd.read_csv("dataset/predict_df.csv")
+from utils.ingest import read_dataset
+from utils.manifest import read_manifest
+from utils.preprocess import build_schema, write_schema
 
 # ==========================
 # SELECTED FEATURES
@@ -30,40 +38,214 @@ selected_features = [
     'Consumer Prices, General Indices (2015 = 100)'
 ]
 
-X = df[selected_features]
-y = df["Food Insecurity Rate"]
-
 # ==========================
-# TRAIN TEST SPLIT
+# SEARCH SPACE
 # ==========================
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
-)
+SEARCH_GRID = {
+    "max_depth": [None, 6, 10, 16],
+    "max_features": [1.0, 0.5, "sqrt"],
+}
+
+TREE_STEP = 25
+MAX_TREES = 500
+OOB_TOLERANCE = 1e-3
+OOB_PATIENCE = 2
+
+REPORT_PATH = "models/prediction/search_report.csv"
+
 
 # ==========================
-# TRAIN MODEL
+# FIXED TRAINING
 # ==========================
-model = RandomForestRegressor(
-    n_estimators=300,
-    random_state=42
-)
+def train_fixed(X_train, X_test, y_train, y_test):
+    model = RandomForestRegressor(
+        n_estimators=300,
+        random_state=42
+    )
+
+    model.fit(X_train, y_train)
+
+    preds = model.predict(X_test)
+    mae = mean_absolute_error(y_test, preds)
+    r2 = r2_score(y_test, preds)
+
+    print("MAE:", round(mae, 3))
+    print("R2:", round(r2, 3))
+
+    joblib.dump(model, "models/prediction/food_model.pkl")
 
-model.fit(X_train, y_train)
 
 # ==========================
-# EVALUATE
+# SEARCH: ONE CONFIGURATION
 # ==========================
-preds = model.predict(X_test)
-mae = mean_absolute_error(y_test, preds)
-r2 = r2_score(y_test, preds)
+def grow_forest(X_train, y_train, max_depth, max_features):
+    # Add TREE_STEP trees at a time until the OOB score stops improving
+    model = RandomForestRegressor(
+        n_estimators=TREE_STEP,
+        max_depth=max_depth,
+        max_features=max_features,
+        oob_score=True,
+        warm_start=True,
+        random_state=42,
+        n_jobs=1,
+    )
+
+    best_oob = -np.inf
+    stale = 0
+    oob_path = []
+
+    while True:
+        model.fit(X_train, y_train)
+        oob_path.append(model.oob_score_)
+
+        if model.oob_score_ > best_oob + OOB_TOLERANCE:
+            best_oob = model.oob_score_
+            stale = 0
+        else:
+            stale += 1
+
+        if stale >= OOB_PATIENCE or model.n_estimators >= MAX_TREES:
+            break
+
+        model.n_estimators += TREE_STEP
+
+    return model, oob_path
+
+
+def measure_latency(pipeline, X, repeats=50):
+    row = X.iloc[:1]
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        pipeline.predict(row)
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pipeline.predict(X)
+    batch_seconds = time.perf_counter() - start
+
+    return np.median(times) * 1000, batch_seconds / len(X) * 1e6
+
+
+def evaluate_config(X_train, X_test, y_train, y_test, max_depth, max_features):
+    scaler = StandardScaler().fit(X_train)
+
+    start = time.perf_counter()
+    model, oob_path = grow_forest(scaler.transform(X_train), y_train, max_depth, max_features)
+    fit_seconds = time.perf_counter() - start
+
+    pipeline = Pipeline([("scaler", scaler), ("rf", model)])
+
+    preds = pipeline.predict(X_test)
+
+    # Selection uses the OOB scores; the test split is only reported
+    result = {
+        "max_depth": max_depth,
+        "max_features": max_features,
+        "n_estimators": model.n_estimators,
+        "oob_r2": oob_path[-1],
+        "oob_rmse": mean_squared_error(y_train, model.oob_prediction_) ** 0.5,
+        "test_r2": r2_score(y_test, preds),
+        "test_rmse": mean_squared_error(y_test, preds) ** 0.5,
+        "test_mae": mean_absolute_error(y_test, preds),
+        "fit_seconds": fit_seconds,
+        "size_mb": len(pickle.dumps(pipeline)) / 1e6,
+    }
+    return result, pipeline
 
-print("MAE:", round(mae, 3))
-print("R2:", round(r2, 3))
 
 # ==========================
-# SAVE MODEL + FEATURES
+# SEARCH: ALL CONFIGURATIONS
 # ==========================
-joblib.dump(model, "models/prediction/food_model.pkl")
-joblib.dump(selected_features, "models/prediction/feature_columns.pkl")
+def search(X_train, X_test, y_train, y_test, n_jobs=-1):
+    configs = list(itertools.product(SEARCH_GRID["max_depth"], SEARCH_GRID["max_features"]))
+
+    outputs = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_config)(X_train, X_test, y_train, y_test, depth, features)
+        for depth, features in configs
+    )
+
+    report = pd.DataFrame([result for result, _ in outputs])
+    pipelines = [pipeline for _, pipeline in outputs]
+
+    # Latency is measured serially so the workers do not skew it
+    latency = [measure_latency(pipeline, X_test) for pipeline in pipelines]
+    report["single_row_ms"] = [single for single, _ in latency]
+    report["batch_us_per_row"] = [batch for _, batch in latency]
+
+    return report, pipelines
+
+
+def pick_smallest(report, target_r2=None, target_rmse=None):
+    # Smallest forest whose OOB accuracy matches the published model; else
+    # (or with no published model) the best OOB R2
+    if target_r2 is None or target_rmse is None:
+        return report["oob_r2"].idxmax()
+    eligible = report[(report["oob_r2"] >= target_r2) & (report["oob_rmse"] <= target_rmse)]
+    if eligible.empty:
+        return report["oob_r2"].idxmax()
+    return eligible["size_mb"].idxmin()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the food insecurity prediction model.")
+    parser.add_argument("--data", default="dataset/predict_df.parquet")
+    parser.add_argument("--search", action="store_true",
+                        help="Run the parallel hyperparameter search and export the best pipeline")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--output", default="models/prediction/pred_pipeline.pkl")
+    args = parser.parse_args(argv)
+
+    # ==========================
+    # LOAD DATA
+    # ==========================
+    df = read_dataset(args.data)
+
+    X = df[selected_features]
+    y = df["Food Insecurity Rate"]
+
+    # ==========================
+    # TRAIN TEST SPLIT
+    # ==========================
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    if not args.search:
+        train_fixed(X_train, X_test, y_train, y_test)
+    else:
+        # Accuracy of the currently published model, from models/manifest.json
+        models = (read_manifest() or {}).get("models", {})
+        published = (models.get("prediction") or {}).get("metrics") or {}
+        if not published:
+            print("No published prediction metrics; selecting on OOB R2 alone")
+
+        report, pipelines = search(X_train, X_test, y_train, y_test, args.n_jobs)
+        best = pick_smallest(report, published.get("r_square_score"), published.get("rmse"))
+
+        report["selected"] = report.index == best
+        report = report.sort_values("size_mb")
+        report.to_csv(REPORT_PATH, index=False)
+
+        with pd.option_context("display.width", 200, "display.max_columns", None):
+            print(report.round(4).to_string(index=False))
+
+        joblib.dump(pipelines[best], args.output)
+        selected = report.loc[best]
+        print(f"Best pipeline ({selected['n_estimators']} trees) saved to {args.output}")
+        print(f"Test R2: {selected['test_r2']:.3f}  RMSE: {selected['test_rmse']:.3f}  MAE: {selected['test_mae']:.3f}")
+        print(f"Search report saved to {REPORT_PATH}")
+
+    # ==========================
+    # SAVE FEATURES
+    # ==========================
+    joblib.dump(selected_features, "models/prediction/feature_columns.pkl")
+
+    # Plausible input ranges for validation, from the training split
+    write_schema(build_schema(X_train, selected_features))
+
+    print("Prediction model saved successfully.")
+
 
-print("Prediction model saved successfully.")
+if __name__ == "__main__":
+    main()
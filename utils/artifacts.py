@@ -0,0 +1,311 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils.manifest import (
+    MANIFEST_PATH,
+    MODELS,
+    artifact_hashes,
+    describe_models,
+    manifest_stamp,
+    read_manifest,
+)
+from utils.timing import span
+
+log = logging.getLogger(__name__)
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_joblib(path):
+    import joblib
+    return joblib.load(path)
+
+
+def load_yaml(path):
+    import yaml
+
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def load_fresh_forecast_table(path):
+    from utils.forecast_table import load_forecast_table, is_fresh
+
+    # Served only when its input hash matches the current files
+    table = load_forecast_table(path)
+    return table if is_fresh(table) else None
+
+
+def load_attributions(path):
+    from utils.attributions import load_attribution_table
+    return load_attribution_table(path)
+
+
+def load_compact(path):
+    from utils.compact_forest import load_compact_forest
+    return load_compact_forest(path)
+
+
+def load_input_schema(path):
+    from utils.preprocess import read_schema
+    return read_schema(path)
+
+
+def load_encoding(path):
+    from utils.features import load_country_encoding
+    return load_country_encoding(path)
+
+
+def load_backtest(path):
+    from utils.backtest import load_table
+    return load_table(path)
+
+
+def load_store(path):
+    from utils.dataset_store import load_dataset_store, serving_columns
+    return load_dataset_store(path, columns=serving_columns())
+
+
+# name -> (path, loader)
+ARTIFACTS = {
+    "forecast_df": ("dataset/forecast_dataset.csv", pd.read_csv),
+    "forecast_store": ("dataset/forecast_dataset.parquet", load_store),
+    "pipeline": ("models/prediction/pred_pipeline.pkl", load_joblib),
+    "compact_forest": ("models/prediction/pred_forest.bin", load_compact),
+    "surrogate": ("models/prediction/pred_surrogate.bin", load_compact),
+    "feature_columns": ("models/prediction/feature_columns.pkl", load_joblib),
+    "input_schema": ("models/prediction/input_schema.json", load_input_schema),
+    "prediction_metrics": ("models/prediction/prediction_metrics.pkl", load_joblib),
+    "forecast_model": ("models/forecast/rf_forecast_model.pkl", load_joblib),
+    "forecast_features": ("models/forecast/forecast_feature_columns.pkl", load_joblib),
+    "country_encoding": ("models/forecast/country_encoding.json", load_encoding),
+    "attributions": ("models/prediction/attributions.parquet", load_attributions),
+    "forecast_metrics": ("models/forecast/forecast_metrics.pkl", load_joblib),
+    "backtest_by_horizon": ("models/forecast/backtest_by_horizon.parquet", load_backtest),
+    "backtest_by_country": ("models/forecast/backtest_by_country.parquet", load_backtest),
+    "forecast_table": ("models/forecast/forecast_table.parquet", load_fresh_forecast_table),
+    "config": ("config.yaml", load_yaml),
+}
+
+# Artifacts derived from others; reloaded whenever an input changes
+DEPENDENCIES = {
+    "forecast_store": ["forecast_df", "feature_columns", "forecast_features"],
+    "forecast_table": ["forecast_df", "forecast_store", "forecast_model", "forecast_features", "country_encoding"],
+    "attributions": ["pipeline"],
+}
+
+# Artifacts each dashboard page needs before it can render
+PAGE_ARTIFACTS = {
+    "ML Prediction": ["config", "feature_columns", "input_schema", "compact_forest", "surrogate", "forecast_store"],
+    # forecast_model is loaded only when the precomputed table is stale
+    "ML Forecasting": [
+        "config", "forecast_store", "forecast_features", "country_encoding", "forecast_table",
+        "backtest_by_horizon", "backtest_by_country",
+    ],
+}
+
+
+class ArtifactRegistry:
+    """Loads artifacts on first use and keeps them until the manifest changes.
+
+    Safe to share between Streamlit sessions and the warmup thread: each
+    artifact is loaded at most once per version, guarded by its own lock.
+
+    refresh() checks the manifest's mtime/size (at most every
+    check_interval seconds) and, when it changed, reloads only the loaded
+    artifacts whose hash changed, plus their dependents. Files the
+    manifest does not list are checked by mtime/size on every refresh
+    and by their own hash when that changed. New objects are
+    built first and then published with a single dict swap, so a rerun
+    already holding the old model finishes with it.
+    """
+
+    def __init__(self, artifacts=ARTIFACTS, manifest_path=MANIFEST_PATH, check_interval=2.0):
+        self.artifacts = artifacts
+        self.manifest_path = manifest_path
+        self.check_interval = check_interval
+
+        # name -> (value, sha256 or None); replaced as a whole on reload
+        self.entries = {}
+        self.errors = {}
+        self.hashes = {}
+        # name -> (mtime, size) of artifacts the manifest does not list
+        self.file_stamps = {}
+        self.locks = {name: threading.Lock() for name in artifacts}
+        self.refresh_lock = threading.Lock()
+        self.warmup_lock = threading.Lock()
+        self.warmup_thread = None
+
+        self.manifest_stamp = manifest_stamp(manifest_path)
+        self.manifest = read_manifest(manifest_path)
+        self.last_check = time.monotonic()
+
+    def load(self, name):
+        path, loader = self.artifacts[name]
+        with span(f"artifact:{name}"):
+            return loader(path)
+
+    def get(self, name):
+        return self.versioned(name)[0]
+
+    def versioned(self, name):
+        # (value, content hash) from the same version of the artifact
+        entry = self.entries.get(name)
+        if entry is not None:
+            return entry
+
+        with self.locks[name]:
+            entry = self.entries.get(name)
+            if entry is None:
+                try:
+                    value = self.load(name)
+                except Exception as e:
+                    self.errors[name] = e
+                    raise
+                self.errors.pop(name, None)
+
+                entry = (value, artifact_hashes(self.manifest).get(name) or self.file_version(name))
+                self.entries = {**self.entries, name: entry}
+
+        return entry
+
+    def content_hash(self, name):
+        # From the manifest when listed there; otherwise SHA-256 of the
+        # file, computed once per process
+        entry = self.entries.get(name)
+        if entry is not None and entry[1] is not None:
+            return entry[1]
+
+        manifest_hash = artifact_hashes(self.manifest).get(name)
+        if manifest_hash is not None:
+            return manifest_hash
+
+        if name not in self.hashes:
+            self.hashes[name] = file_hash(self.artifacts[name][0])
+        return self.hashes[name]
+
+    def file_version(self, name):
+        path = self.artifacts[name][0]
+        return file_hash(path) if os.path.exists(path) else None
+
+    def try_get(self, name):
+        try:
+            return self.get(name)
+        except Exception:
+            return None
+
+    def model_info(self, model):
+        # Version and metrics from the manifest, else from the metrics files
+        if self.manifest is not None and model in self.manifest.get("models", {}):
+            return self.manifest["models"][model]
+
+        artifact = MODELS[model][0]
+        try:
+            hashes = {artifact: self.content_hash(artifact)}
+        except FileNotFoundError:
+            hashes = {}
+        return describe_models(hashes, self.try_get).get(model)
+
+    # ==========================
+    # HOT RELOAD
+    # ==========================
+    def refresh(self, force=False):
+        """Reload artifacts whose manifest or file hash changed; returns their names."""
+        now = time.monotonic()
+        if not force and now - self.last_check < self.check_interval:
+            return []
+
+        with self.refresh_lock:
+            self.last_check = now
+            stamp = manifest_stamp(self.manifest_path)
+            manifest = self.manifest if stamp == self.manifest_stamp else read_manifest(self.manifest_path)
+            old_hashes = artifact_hashes(self.manifest)
+            new_hashes = artifact_hashes(manifest)
+
+            changed = {
+                name for name in self.artifacts
+                if old_hashes.get(name) != new_hashes.get(name)
+                or (name in self.entries and name in new_hashes and self.entries[name][1] != new_hashes[name])
+            }
+            # Files the manifest does not list are watched on every check
+            changed.update(self.unlisted_changes(new_hashes))
+            if not changed and stamp == self.manifest_stamp:
+                return []
+
+            for name, inputs in DEPENDENCIES.items():
+                if changed.intersection(inputs):
+                    changed.add(name)
+
+            reloaded = {}
+            for name in sorted(changed & set(self.entries)):
+                with self.locks[name]:
+                    try:
+                        reloaded[name] = (self.load(name), new_hashes.get(name) or self.file_version(name))
+                    except Exception as e:
+                        # Keep serving the previous version
+                        self.errors[name] = e
+                        log.warning("Reloading %s failed: %s", name, e)
+                        continue
+                    self.errors.pop(name, None)
+
+            for name in changed:
+                self.hashes.pop(name, None)
+
+            # Publish everything at once
+            self.entries = {**self.entries, **reloaded}
+            self.manifest = manifest
+            self.manifest_stamp = stamp
+
+            if reloaded:
+                log.info("Reloaded artifacts: %s", ", ".join(sorted(reloaded)))
+            return sorted(reloaded)
+
+    def unlisted_changes(self, listed):
+        """Unlisted artifacts that are loaded, or inputs of loaded ones,
+        whose file changed since the last check (mtime/size first, then
+        the loaded version's hash)."""
+        watched = set(self.entries)
+        for name, inputs in DEPENDENCIES.items():
+            if name in self.entries:
+                watched.update(inputs)
+
+        changed = set()
+        for name in sorted(watched - set(listed)):
+            stamp = manifest_stamp(self.artifacts[name][0])
+            first_check = name not in self.file_stamps
+            if not first_check and self.file_stamps[name] == stamp:
+                continue
+            self.file_stamps[name] = stamp
+
+            entry = self.entries.get(name)
+            if entry is not None:
+                if entry[1] != self.file_version(name):
+                    changed.add(name)
+            elif not first_check:
+                # Not loaded itself, but a loaded artifact depends on it
+                changed.add(name)
+        return changed
+
+    def warm(self, names=None):
+        # Load the remaining artifacts in the background, once per process
+        names = list(self.artifacts) if names is None else names
+
+        def run():
+            for name in names:
+                self.try_get(name)
+
+        with self.warmup_lock:
+            if self.warmup_thread is None:
+                self.warmup_thread = threading.Thread(target=run, name="artifact-warmup", daemon=True)
+                self.warmup_thread.start()
@@ -0,0 +1,248 @@
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from utils.features import COUNTRY
+
+ATTRIBUTIONS_PATH = "models/prediction/attributions.parquet"
+HASH_KEY = b"pipeline_sha256"
+
+BASE_VALUE = "base_value"
+PREDICTION = "prediction"
+
+
+# ==========================
+# PATH-DEPENDENT TREESHAP
+# ==========================
+# Exact TreeSHAP (Lundberg et al., Algorithm 2) vectorized over rows: the
+# tree is walked once and every path element carries a per-row "one
+# fraction" (1 if the row follows that branch, else 0), so both children
+# of a split are visited with complementary row masks.
+
+def extend_path(features, zeros, ones, weights, zero_fraction, one_fraction, feature):
+    depth = len(features)
+    features = features + [feature]
+    zeros = zeros + [zero_fraction]
+    ones = ones + [one_fraction]
+
+    if depth == 0:
+        return features, zeros, ones, np.ones((1, len(one_fraction)))
+
+    old = np.vstack([weights, np.zeros((1, weights.shape[1]))])
+    k = np.arange(depth + 1)[:, None]
+
+    new = zero_fraction * old * (depth - k) / (depth + 1)
+    new[1:] += one_fraction * old[:-1] * k[1:] / (depth + 1)
+
+    return features, zeros, ones, new
+
+
+def tree_shap(tree, Xs):
+    """SHAP values of one tree for every row of Xs (already preprocessed)."""
+    left = tree["left"]
+    right = tree["right"]
+    feature = tree["feature"]
+    threshold = tree["threshold"]
+    value = tree["value"]
+    cover = tree["cover"]
+
+    n_rows, n_features = Xs.shape
+    phi = np.zeros((n_rows, n_features))
+
+    def unwind(features, zeros, ones, weights, index):
+        depth = len(features) - 1
+        one_fraction = ones[index]
+        zero_fraction = zeros[index]
+        has_one = one_fraction != 0
+        safe_one = np.where(has_one, one_fraction, 1.0)
+
+        next_one = weights[depth]
+        new_weights = weights[:depth].copy()
+
+        for i in range(depth - 1, -1, -1):
+            current = weights[i]
+            from_one = next_one * (depth + 1) / ((i + 1) * safe_one)
+            from_zero = current * (depth + 1) / (zero_fraction * (depth - i))
+            new_weights[i] = np.where(has_one, from_one, from_zero)
+            next_one = current - new_weights[i] * zero_fraction * (depth - i) / (depth + 1)
+
+        del features[index], zeros[index], ones[index]
+        return features, zeros, ones, new_weights
+
+    def leaf(features, zeros, ones, weights, leaf_value):
+        depth = len(features) - 1
+        if depth == 0:
+            return
+
+        # Unwound path sums for every element 1..depth at once
+        o = np.vstack(ones[1:])
+        z = np.asarray(zeros[1:])[:, None]
+        has_one = o != 0
+        safe_one = np.where(has_one, o, 1.0)
+
+        total_one = np.zeros_like(o)
+        total_zero = np.zeros_like(o)
+        next_one = np.broadcast_to(weights[depth], o.shape)
+
+        for i in range(depth - 1, -1, -1):
+            tmp = next_one / ((i + 1) * safe_one)
+            total_one += tmp
+            next_one = weights[i] - tmp * z * (depth - i)
+            total_zero += weights[i] / (z * (depth - i))
+
+        total = np.where(has_one, total_one, total_zero) * (depth + 1)
+        phi[:, features[1:]] += (total * (o - z) * leaf_value).T
+
+    def recurse(node, features, zeros, ones, weights, zero_fraction, one_fraction, split_feature):
+        features, zeros, ones, weights = extend_path(
+            features, zeros, ones, weights, zero_fraction, one_fraction, split_feature
+        )
+
+        if left[node] == -1:
+            leaf(features, zeros, ones, weights, value[node])
+            return
+
+        f = feature[node]
+        go_left = (Xs[:, f] <= threshold[node]).astype(float)
+
+        incoming_zero = 1.0
+        incoming_one = np.ones(n_rows)
+        if f in features:
+            index = features.index(f)
+            incoming_zero = zeros[index]
+            incoming_one = ones[index]
+            features, zeros, ones, weights = unwind(list(features), list(zeros), list(ones), weights, index)
+
+        for child, direction in ((left[node], go_left), (right[node], 1.0 - go_left)):
+            recurse(
+                child, features, zeros, ones, weights,
+                incoming_zero * cover[child] / cover[node],
+                incoming_one * direction,
+                f,
+            )
+
+    recurse(0, [], [], [], None, 1.0, np.ones(n_rows), -1)
+
+    expected = float((value * (left == -1) * cover).sum() / cover[0])
+    return phi, expected
+
+
+def tree_arrays(estimator):
+    tree = estimator.tree_
+    return {
+        "left": tree.children_left,
+        "right": tree.children_right,
+        "feature": tree.feature,
+        "threshold": tree.threshold,
+        "value": tree.value[:, 0, 0],
+        "cover": tree.weighted_n_node_samples,
+    }
+
+
+def shap_for_trees(trees, Xs):
+    phi = np.zeros(Xs.shape)
+    expected = 0.0
+    for tree in trees:
+        tree_phi, tree_expected = tree_shap(tree, Xs)
+        phi += tree_phi
+        expected += tree_expected
+    return phi, expected
+
+
+# ==========================
+# FOREST / PIPELINE
+# ==========================
+def forest_shap(pipeline, X, n_jobs=-1):
+    """Exact SHAP values of the pipeline's forest for a batch of rows.
+
+    Returns (phi, base_value) with phi of shape (n_rows, n_features).
+    Preprocessing is applied first; it acts per feature, so attributions
+    map one-to-one onto the raw input columns. Trees are split across
+    n_jobs worker processes.
+    """
+    steps = getattr(pipeline, "steps", [(None, pipeline)])
+    forest = steps[-1][1]
+
+    Xs = np.asarray(pipeline[:-1].transform(X) if len(steps) > 1 else X, dtype=np.float64)
+
+    # sklearn compares float32 inputs against the thresholds
+    Xs = Xs.astype(np.float32)
+
+    trees = [tree_arrays(e) for e in forest.estimators_]
+
+    n_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    groups = [trees[i::n_workers] for i in range(n_workers) if trees[i::n_workers]]
+
+    results = Parallel(n_jobs=len(groups))(delayed(shap_for_trees)(group, Xs) for group in groups)
+
+    phi = sum(r[0] for r in results) / len(trees)
+    base_value = sum(r[1] for r in results) / len(trees)
+    return phi, base_value
+
+
+# ==========================
+# PRECOMPUTED TABLE
+# ==========================
+def build_attribution_table(pipeline, df, feature_columns, n_jobs=-1):
+    X = df[feature_columns]
+    phi, base_value = forest_shap(pipeline, X, n_jobs)
+
+    table = pd.DataFrame(phi, columns=feature_columns)
+    table.insert(0, COUNTRY, df[COUNTRY].astype(str).to_numpy())
+    table.insert(1, "Year", df["Year"].to_numpy())
+    table[BASE_VALUE] = base_value
+    table[PREDICTION] = pipeline.predict(X)
+    return table
+
+
+def write_attribution_table(table, pipeline_hash, path=ATTRIBUTIONS_PATH):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_table = pa.Table.from_pandas(table, preserve_index=False)
+    metadata = dict(arrow_table.schema.metadata or {})
+    metadata[HASH_KEY] = pipeline_hash.encode()
+
+    pq.write_table(arrow_table.replace_schema_metadata(metadata), path)
+
+
+class AttributionTable:
+
+    def __init__(self, table, pipeline_hash):
+        self.table = table
+        self.pipeline_hash = pipeline_hash
+        self.feature_columns = [
+            c for c in table.columns if c not in (COUNTRY, "Year", BASE_VALUE, PREDICTION)
+        ]
+        self.index = {
+            (c, int(y)): i for i, (c, y) in enumerate(zip(table[COUNTRY], table["Year"]))
+        }
+
+    def lookup(self, country, year):
+        # Attributions sorted by absolute contribution, or None if unknown
+        i = self.index.get((country, int(year)))
+        if i is None:
+            return None
+
+        row = self.table.iloc[i]
+        drivers = row[self.feature_columns].astype(float)
+        drivers = drivers.reindex(drivers.abs().sort_values(ascending=False).index)
+
+        return {
+            "base_value": float(row[BASE_VALUE]),
+            "prediction": float(row[PREDICTION]),
+            "drivers": drivers,
+        }
+
+
+def load_attribution_table(path=ATTRIBUTIONS_PATH):
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(path):
+        return None
+
+    table = pq.read_table(path)
+    pipeline_hash = (table.schema.metadata or {}).get(HASH_KEY, b"").decode()
+    return AttributionTable(table.to_pandas(), pipeline_hash)
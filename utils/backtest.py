@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.features import (
+    COUNTRY,
+    COUNTRY_MEAN,
+    TARGET,
+    build_training_matrix,
+    fit_country_encoding,
+)
+from utils.forecast import recursive_forecast
+
+BACKTEST_CACHE_DIR = "models/forecast/backtest_cache"
+BACKTEST_ERRORS_PATH = "models/forecast/backtest_errors.parquet"
+BY_HORIZON_PATH = "models/forecast/backtest_by_horizon.parquet"
+BY_COUNTRY_PATH = "models/forecast/backtest_by_country.parquet"
+
+# Same settings as scripts/train_rf_forecast_model, one core per fold
+MODEL_PARAMS = {"n_estimators": 300, "random_state": 42}
+
+# Years of data before the first cutoff, and years forecast past each cutoff
+MIN_TRAIN_YEARS = 8
+MAX_HORIZON = 5
+
+
+# ==========================
+# FOLDS
+# ==========================
+def cutoff_years(df, min_train_years=MIN_TRAIN_YEARS):
+    # Every year with at least min_train_years before it and one year after it
+    first, last = int(df["Year"].min()), int(df["Year"].max())
+    return list(range(first + min_train_years - 1, last))
+
+
+def fold_key(train_rows, forecast_features, params):
+    # Depends only on the rows up to the cutoff, so adding a new year of
+    # data leaves earlier folds cached
+    rows = train_rows.sort_values([COUNTRY, "Year"], kind="stable").reset_index(drop=True)
+
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+    digest.update(json.dumps([list(rows.columns), list(forecast_features), params], sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+def fit_fold(train_rows, forecast_features, params):
+    from sklearn.ensemble import RandomForestRegressor
+
+    encoding = fit_country_encoding(train_rows) if COUNTRY_MEAN in forecast_features else None
+    X, y, _ = build_training_matrix(train_rows, forecast_features, encoding=encoding)
+
+    model = RandomForestRegressor(n_jobs=1, **params)
+    model.fit(pd.DataFrame(X, columns=forecast_features), y)
+    return model, encoding
+
+
+def run_fold(df, cutoff, forecast_features, params=MODEL_PARAMS,
+             max_horizon=MAX_HORIZON, cache_dir=BACKTEST_CACHE_DIR):
+    """Train on years <= cutoff, forecast up to max_horizon years ahead and
+    score every country-year that has an actual value.
+
+    Returns (errors, cached, seconds).
+    """
+    import joblib
+
+    start = time.perf_counter()
+    train_rows = df[df["Year"] <= cutoff]
+
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"fold_{cutoff}_{fold_key(train_rows, forecast_features, params)}.joblib")
+
+    cached = path is not None and os.path.exists(path)
+    if cached:
+        model, encoding = joblib.load(path)
+    else:
+        model, encoding = fit_fold(train_rows, forecast_features, params)
+        if path is not None:
+            joblib.dump((model, encoding), path, compress=3)
+
+    forecast = recursive_forecast(
+        model, train_rows, forecast_features, cutoff + max_horizon, encoding=encoding
+    )
+
+    actual = df[[COUNTRY, "Year", TARGET]].rename(columns={TARGET: "actual"})
+    errors = forecast.rename(columns={TARGET: "predicted"}).merge(actual, on=[COUNTRY, "Year"])
+    errors.insert(0, "cutoff", cutoff)
+    errors["error"] = errors["predicted"] - errors["actual"]
+
+    return errors, cached, time.perf_counter() - start
+
+
+def run_backtest(df, forecast_features, cutoffs=None, workers=None, params=MODEL_PARAMS,
+                 max_horizon=MAX_HORIZON, cache_dir=BACKTEST_CACHE_DIR):
+    """Rolling-origin evaluation with one process per fold.
+
+    Returns (errors, folds): every scored (cutoff, country, year) and a
+    per-fold frame with cutoff, rows, cached and seconds.
+    """
+    if cutoffs is None:
+        cutoffs = cutoff_years(df)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+
+    df = df.copy()
+    df[COUNTRY] = df[COUNTRY].astype(str)
+
+    errors = []
+    folds = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            cutoff: pool.submit(run_fold, df, cutoff, forecast_features, params, max_horizon, cache_dir)
+            for cutoff in cutoffs
+        }
+        for cutoff, future in futures.items():
+            fold_errors, cached, seconds = future.result()
+            errors.append(fold_errors)
+            folds.append({"cutoff": cutoff, "rows": len(fold_errors), "cached": cached, "seconds": seconds})
+
+    return pd.concat(errors, ignore_index=True), pd.DataFrame(folds)
+
+
+# ==========================
+# ERROR TABLES
+# ==========================
+def error_table(errors, by):
+    abs_error = errors["error"].abs()
+    pct_error = (abs_error / errors["actual"].abs()).where(errors["actual"] != 0)
+
+    table = (
+        errors.assign(abs_error=abs_error, sq_error=errors["error"] ** 2, pct_error=pct_error)
+        .groupby(by, observed=True)
+        .agg(
+            n=("error", "size"),
+            MAE=("abs_error", "mean"),
+            RMSE=("sq_error", "mean"),
+            MAPE=("pct_error", "mean"),
+            bias=("error", "mean"),
+        )
+        .reset_index()
+    )
+    table["RMSE"] = np.sqrt(table["RMSE"])
+    table["MAPE"] = table["MAPE"] * 100
+    return table
+
+
+def write_tables(errors, errors_path=BACKTEST_ERRORS_PATH,
+                 by_horizon_path=BY_HORIZON_PATH, by_country_path=BY_COUNTRY_PATH):
+    by_horizon = error_table(errors, "horizon")
+    by_country = error_table(errors, [COUNTRY, "horizon"])
+
+    errors.to_parquet(errors_path, index=False)
+    by_horizon.to_parquet(by_horizon_path, index=False)
+    by_country.to_parquet(by_country_path, index=False)
+    return by_horizon, by_country
+
+
+def load_table(path):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path)
@@ -0,0 +1,180 @@
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.preprocess import Schema, load_schema
+
+PIPELINE_PATH = "models/prediction/pred_pipeline.pkl"
+
+PREDICTION_COLUMN = "Predicted Food Insecurity Rate"
+ERRORS_COLUMN = "Input Errors"
+ID_COLUMNS = ["Country", "Year"]
+
+
+# ==========================
+# INPUT READERS
+# ==========================
+def read_header(path):
+    # Column names only, without loading any rows
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).schema_arrow.names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def iter_chunks(path, chunksize, columns, text_columns=()):
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        # CSV dtypes are inferred per chunk; columns read as text keep one
+        # type across chunks (e.g. an ID column that is empty in chunk 1)
+        dtype = {c: "string" for c in text_columns}
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns, dtype=dtype)
+
+
+# ==========================
+# OUTPUT WRITERS
+# ==========================
+class ChunkWriter:
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet_writer = None
+        self.first = True
+
+    def write(self, df):
+        if self.path.endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self.parquet_writer is None:
+                schema = pa.Table.from_pandas(df, preserve_index=False).schema
+                self.parquet_writer = pq.ParquetWriter(self.path, schema)
+            # Later chunks are converted to the first chunk's schema
+            table = pa.Table.from_pandas(df, schema=self.parquet_writer.schema, preserve_index=False)
+            self.parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="w" if self.first else "a", header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+
+# ==========================
+# SCORING
+# ==========================
+def align_columns(header, feature_columns, keep_columns=None):
+    missing = [c for c in feature_columns if c not in header]
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {missing}")
+
+    if keep_columns is None:
+        keep_columns = [c for c in ID_COLUMNS if c in header]
+
+    keep_columns = [c for c in keep_columns if c not in feature_columns]
+    return keep_columns, keep_columns + list(feature_columns)
+
+
+def predict_chunk(model, chunk, schema):
+    validation = schema.validate(chunk)
+
+    # Rows that fail validation cannot be scored; leave them as NaN
+    preds = np.full(len(chunk), np.nan)
+    if validation.valid.any():
+        preds[validation.valid] = model.predict(validation.frame()[validation.valid])
+
+    return preds, validation
+
+
+def error_labels(validation):
+    # "feature: problem; ..." for rows that failed validation, "" otherwise
+    labels = np.full(len(validation.valid), "", dtype=object)
+    for i in np.flatnonzero(~validation.valid):
+        labels[i] = "; ".join(f"{feature}: {problem}" for feature, problem in validation.row_errors(i))
+    return labels
+
+
+def predict_file(input_path, output_path, chunksize=50_000, keep_columns=None,
+                 model=None, feature_columns=None, verbose=True):
+
+    if model is None:
+        model = joblib.load(PIPELINE_PATH)
+    schema = load_schema()
+    if feature_columns is None:
+        feature_columns = schema.columns
+    elif list(feature_columns) != schema.columns:
+        # No learned ranges for a different feature set
+        schema = Schema(feature_columns)
+
+    keep_columns, read_columns = align_columns(
+        read_header(input_path), feature_columns, keep_columns
+    )
+
+    writer = ChunkWriter(output_path)
+    total_rows = 0
+    invalid_rows = 0
+    start = time.perf_counter()
+
+    try:
+        # Pass-through columns are written as read, so they must have a
+        # stable type; predictions and errors always do
+        for chunk in iter_chunks(input_path, chunksize, read_columns, text_columns=keep_columns):
+
+            out = chunk[keep_columns].copy()
+            preds, validation = predict_chunk(model, chunk, schema)
+            out[PREDICTION_COLUMN] = preds
+            out[ERRORS_COLUMN] = error_labels(validation)
+            writer.write(out)
+
+            total_rows += len(chunk)
+            invalid_rows += int((~validation.valid).sum())
+
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"Scored {total_rows:,} rows ({total_rows / elapsed:,.0f} rows/sec)")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+
+    return {
+        "rows": total_rows,
+        "invalid_rows": invalid_rows,
+        "seconds": elapsed,
+        "rows_per_sec": total_rows / elapsed if elapsed > 0 else float("inf"),
+    }
+
+
+# ==========================
+# CLI
+# ==========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a CSV or Parquet file of indicator rows with the prediction pipeline."
+    )
+    parser.add_argument("input", help="Input .csv or .parquet file")
+    parser.add_argument("output", help="Output .csv or .parquet file")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    parser.add_argument(
+        "--keep", nargs="*", default=None,
+        help="Columns copied to the output next to the prediction (default: Country, Year)"
+    )
+    args = parser.parse_args(argv)
+
+    stats = predict_file(args.input, args.output, args.chunksize, args.keep)
+
+    print(
+        f"Done: {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_sec']:,.0f} rows/sec), {stats['invalid_rows']:,} rows failed validation"
+    )
+
+
+if __name__ == "__main__":
+    main()
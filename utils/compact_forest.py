@@ -0,0 +1,219 @@
+import json
+import struct
+
+import numpy as np
+
+COMPACT_FOREST_PATH = "models/prediction/pred_forest.bin"
+
+MAGIC = b"CFOREST1"
+ALIGN = 64
+
+# Rows evaluated together; bounds the (rows x trees) node index matrix
+ROW_CHUNK = 4096
+
+
+# ==========================
+# EXPORT
+# ==========================
+def split_pipeline(pipeline):
+    steps = list(getattr(pipeline, "steps", [(None, pipeline)]))
+    forest = steps[-1][1]
+
+    mean = None
+    scale = None
+    for name, step in steps[:-1]:
+        if type(step).__name__ != "StandardScaler" or mean is not None:
+            raise ValueError(f"Unsupported preprocessing step for export: {name}")
+        mean = np.asarray(step.mean_ if step.with_mean else 0.0, dtype=np.float64)
+        scale = np.asarray(step.scale_ if step.with_std else 1.0, dtype=np.float64)
+
+    n_features = forest.n_features_in_
+    if mean is None:
+        mean = np.zeros(n_features)
+        scale = np.ones(n_features)
+
+    return forest, np.broadcast_to(mean, n_features), np.broadcast_to(scale, n_features)
+
+
+def ensemble_trees(model):
+    """(trees, leaf scale, leaf offset) such that the mean over trees of
+    scale * leaf + offset is the model's prediction.
+
+    Forests average their trees as-is. Gradient boosting predicts
+    init + learning_rate * sum(trees), which is the same mean once each
+    leaf is multiplied by learning_rate * n_trees and offset by init.
+    """
+    if hasattr(model, "learning_rate"):
+        trees = list(model.estimators_[:, 0])
+        return trees, model.learning_rate * len(trees), float(model.init_.constant_.reshape(-1)[0])
+    return list(model.estimators_), 1.0, 0.0
+
+
+def flatten_trees(estimators):
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        n = tree.node_count
+        node_ids = np.arange(n)
+
+        leaf = tree.children_left == -1
+
+        # Leaves point at themselves so traversal can run a fixed number
+        # of steps without masking finished rows
+        lefts.append(np.where(leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(leaf, node_ids, tree.children_right) + offset)
+        features.append(np.where(leaf, 0, tree.feature))
+        thresholds.append(np.where(leaf, 0.0, tree.threshold))
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+
+        offset += n
+        max_depth = max(max_depth, tree.max_depth)
+
+    # children[n] = (right, left): the next node is children[n, x <= threshold]
+    children = np.column_stack([np.concatenate(rights), np.concatenate(lefts)])
+
+    return {
+        "children": children.astype(np.int32),
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "value": np.concatenate(values).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int64),
+    }, max_depth
+
+
+def export_compact_forest(pipeline, path=COMPACT_FOREST_PATH, feature_names=None, source_hash=None):
+    """Write the scaler and every tree of the pipeline (a random forest or
+    gradient boosting regressor) as flat node arrays.
+
+    Layout: magic, header length, JSON header, then each array at a
+    64-byte aligned offset so the file can be memory-mapped as-is.
+    source_hash (the pipeline file's SHA-256) is kept in the header so
+    callers can tell whether the export is current.
+    """
+    forest, mean, scale = split_pipeline(pipeline)
+    trees, leaf_scale, leaf_offset = ensemble_trees(forest)
+    arrays, max_depth = flatten_trees(trees)
+    arrays["value"] = arrays["value"] * leaf_scale + leaf_offset
+    arrays["mean"] = np.ascontiguousarray(mean, dtype=np.float64)
+    arrays["scale"] = np.ascontiguousarray(scale, dtype=np.float64)
+
+    if feature_names is None and hasattr(pipeline, "feature_names_in_"):
+        feature_names = list(pipeline.feature_names_in_)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+
+    header = json.dumps({
+        "n_trees": len(trees),
+        "kind": "boosted" if hasattr(forest, "learning_rate") else "forest",
+        "n_features": int(forest.n_features_in_),
+        "max_depth": int(max_depth),
+        "feature_names": feature_names,
+        "source_sha256": source_hash,
+        "arrays": layout,
+    }).encode()
+
+    prefix = len(MAGIC) + 8
+    data_start = -(-(prefix + len(header)) // ALIGN) * ALIGN
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(array.tobytes())
+
+
+# ==========================
+# LOAD + EVALUATE
+# ==========================
+class CompactForest:
+
+    def __init__(self, header, arrays):
+        self.n_trees = header["n_trees"]
+        self.n_features = header["n_features"]
+        self.max_depth = header["max_depth"]
+        self.feature_names = header["feature_names"]
+        self.source_hash = header.get("source_sha256")
+        # Per-tree outputs only spread around the prediction for forests
+        self.kind = header.get("kind", "forest")
+
+        self.children = arrays["children"].reshape(-1)
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.mean = arrays["mean"]
+        self.scale = arrays["scale"]
+
+    def transform(self, X):
+        if hasattr(X, "columns") and self.feature_names is not None:
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float64)
+
+        # Trees compare float32 inputs, as sklearn does
+        return ((X - self.mean) / self.scale).astype(np.float32)
+
+    def apply(self, Xs):
+        # Global leaf index per (row, tree)
+        flat = np.ascontiguousarray(Xs).reshape(-1)
+        row_offsets = (np.arange(len(Xs)) * Xs.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(Xs), self.n_trees))
+
+        for _ in range(self.max_depth):
+            go_left = flat.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = self.children.take(2 * nodes + go_left)
+
+        return nodes
+
+    def predict_per_tree(self, X):
+        """Return a (n_trees, n_rows) array of individual tree outputs."""
+        Xs = self.transform(X)
+        out = np.empty((self.n_trees, len(Xs)))
+
+        for start in range(0, len(Xs), ROW_CHUNK):
+            stop = start + ROW_CHUNK
+            out[:, start:stop] = self.value.take(self.apply(Xs[start:stop])).T
+
+        return out
+
+    def predict(self, X):
+        Xs = self.transform(X)
+        out = np.empty(len(Xs))
+
+        for start in range(0, len(Xs), ROW_CHUNK):
+            stop = start + ROW_CHUNK
+            out[start:stop] = self.value.take(self.apply(Xs[start:stop])).mean(axis=1)
+
+        return out
+
+
+def load_compact_forest(path=COMPACT_FOREST_PATH):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a compact forest file")
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len))
+
+    prefix = len(MAGIC) + 8
+    data_start = -(-(prefix + header_len) // ALIGN) * ALIGN
+
+    # Read-only mapping: pages are shared between processes
+    buffer = np.memmap(path, dtype=np.uint8, mode="r")
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        start = data_start + spec["offset"]
+        nbytes = dtype.itemsize * int(np.prod(spec["shape"]))
+        arrays[name] = buffer[start:start + nbytes].view(dtype).reshape(spec["shape"])
+
+    return CompactForest(header, arrays)
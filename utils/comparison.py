@@ -0,0 +1,45 @@
+import pandas as pd
+
+from utils.forecast import COUNTRY, TARGET
+
+
+# ==========================
+# ALL-COUNTRIES COMPARISON
+# ==========================
+def comparison_frame(history, paths, year):
+    """Long frame for a multi-series chart: each country's history plus its
+    forecast up to `year`, the forecast joined to the last observed point."""
+    history = history[[COUNTRY, "Year", TARGET]]
+    last_observed = history.sort_values("Year").groupby(COUNTRY, observed=True).tail(1)
+    forecast = paths.loc[paths["Year"] <= year, [COUNTRY, "Year", TARGET]]
+
+    frame = pd.concat([
+        history.assign(Series="Historical"),
+        last_observed.assign(Series="Forecast"),
+        forecast.assign(Series="Forecast"),
+    ], ignore_index=True)
+    frame[COUNTRY] = frame[COUNTRY].astype(str)
+    return frame.sort_values([COUNTRY, "Series", "Year"], kind="stable")
+
+
+def ranking_table(history, paths, year):
+    """One row per country at `year`, highest forecast rate first."""
+    last_observed = (
+        history.sort_values("Year")
+        .groupby(COUNTRY, observed=True)
+        .tail(1)[[COUNTRY, "Year", TARGET]]
+        .rename(columns={"Year": "Last Year", TARGET: "Last Observed"})
+    )
+    last_observed[COUNTRY] = last_observed[COUNTRY].astype(str)
+
+    quantile_columns = [c for c in paths.columns if c.startswith("q") and c[1:].isdigit()]
+    at_year = paths.loc[paths["Year"] == year, [COUNTRY, TARGET, *quantile_columns]].rename(
+        columns={TARGET: "Forecast"}
+    )
+    at_year[COUNTRY] = at_year[COUNTRY].astype(str)
+
+    table = at_year.merge(last_observed, on=COUNTRY)
+    table["Change"] = table["Forecast"] - table["Last Observed"]
+    table = table.sort_values("Forecast", ascending=False, kind="stable").reset_index(drop=True)
+    table.insert(0, "Rank", range(1, len(table) + 1))
+    return table.rename(columns={COUNTRY: "Country"})
@@ -0,0 +1,135 @@
+import json
+import logging
+import os
+
+import pandas as pd
+
+from utils.artifacts import file_hash
+from utils.features import COUNTRY_MEAN, DYNAMIC_COLUMNS, TARGET, country_of_column
+from utils.forecast import COUNTRY
+
+log = logging.getLogger(__name__)
+
+DATASET_CSV_PATH = "dataset/forecast_dataset.csv"
+DATASET_STORE_PATH = "dataset/forecast_dataset.parquet"
+
+INDEX_KEY = b"country_row_ranges"
+SOURCE_HASH_KEY = b"source_sha256"
+CATEGORICAL_COLUMNS = ["Country", COUNTRY]
+
+# Feature lists whose raw columns the dashboard pages read from the store
+FEATURE_COLUMN_FILES = [
+    "models/prediction/feature_columns.pkl",
+    "models/forecast/forecast_feature_columns.pkl",
+]
+
+
+# ==========================
+# BUILD
+# ==========================
+def prepare_frame(df):
+    # Rows sorted by country then year so each country is one contiguous range
+    df = df.sort_values([COUNTRY, "Year"], kind="stable").reset_index(drop=True)
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+def country_ranges(df):
+    codes = df[COUNTRY].cat.codes.to_numpy()
+    categories = df[COUNTRY].cat.categories
+
+    ranges = {}
+    start = 0
+    for i in range(1, len(codes) + 1):
+        if i == len(codes) or codes[i] != codes[start]:
+            ranges[str(categories[codes[start]])] = (start, i)
+            start = i
+    return ranges
+
+
+def build_dataset_store(csv_path=DATASET_CSV_PATH, store_path=DATASET_STORE_PATH):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = prepare_frame(pd.read_csv(csv_path))
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[INDEX_KEY] = json.dumps(country_ranges(df)).encode()
+    metadata[SOURCE_HASH_KEY] = file_hash(csv_path).encode()
+
+    pq.write_table(table.replace_schema_metadata(metadata), store_path)
+    return df
+
+
+# ==========================
+# LOAD
+# ==========================
+def serving_columns(feature_files=FEATURE_COLUMN_FILES):
+    """Dataset columns the dashboard reads: the target, the country name
+    and the raw inputs of every model (lags and country encodings are
+    derived at serving time)."""
+    import joblib
+
+    columns = ["Country", TARGET]
+    for path in feature_files:
+        if os.path.exists(path):
+            columns += [
+                c for c in joblib.load(path)
+                if c not in DYNAMIC_COLUMNS and c != COUNTRY_MEAN and country_of_column(c) is None
+            ]
+    return list(dict.fromkeys(columns))
+
+
+class DatasetStore:
+    """Country-sorted dataset with a country -> (start, stop) row index.
+
+    country() returns a positional slice, so per-country access does not
+    scan the frame.
+    """
+
+    def __init__(self, frame, ranges):
+        self.frame = frame
+        self.ranges = ranges
+        self.countries = sorted(ranges)
+
+    def country(self, name):
+        start, stop = self.ranges.get(name, (0, 0))
+        return self.frame.iloc[start:stop]
+
+    def __len__(self):
+        return len(self.frame)
+
+
+def load_dataset_store(store_path=DATASET_STORE_PATH, columns=None, csv_path=DATASET_CSV_PATH):
+    # Only the requested columns are read; the country and year columns
+    # are always included because the index depends on them
+    if columns is not None:
+        columns = list(dict.fromkeys([COUNTRY, "Year", *columns]))
+
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(store_path) if os.path.exists(store_path) else None
+    if schema is not None and os.path.exists(csv_path):
+        if schema.metadata.get(SOURCE_HASH_KEY, b"").decode() != file_hash(csv_path):
+            log.warning("%s was not built from the current %s; reading the CSV "
+                        "(run python -m scripts.build_dataset_store)", store_path, csv_path)
+            schema = None
+
+    if schema is None:
+        df = prepare_frame(pd.read_csv(csv_path))
+        if columns is not None:
+            df = df[[c for c in columns if c in df.columns]]
+        return DatasetStore(df, country_ranges(df))
+
+    if columns is not None:
+        columns = [c for c in columns if c in schema.names]
+    ranges = {
+        country: tuple(bounds)
+        for country, bounds in json.loads(schema.metadata[INDEX_KEY]).items()
+    }
+
+    frame = pq.read_table(store_path, columns=columns).to_pandas()
+    return DatasetStore(frame, ranges)
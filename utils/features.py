@@ -0,0 +1,235 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+TARGET = "Food Insecurity Rate"
+WATER = "water access"
+COUNTRY = "Country_orig"
+
+LAG1 = "Food Insecurity Rate_lag1"
+LAG2 = "Food Insecurity Rate_lag2"
+WATER_LAG1 = "water access_lag1"
+WATER_LAG2 = "water access_lag2"
+ROLL3 = "food_insecurity_roll3"
+TIME_INDEX = "time_index"
+
+DYNAMIC_COLUMNS = [LAG1, LAG2, WATER_LAG1, WATER_LAG2, ROLL3, TIME_INDEX]
+COUNTRY_PREFIXES = ("Country_orig_", "Country_")
+
+# Target-encoded country: one column instead of two one-hot columns per country
+COUNTRY_MEAN = "country_target_mean"
+COUNTRY_ENCODING_PATH = "models/forecast/country_encoding.json"
+
+# Pseudo-count pulling each country's mean toward the global mean
+COUNTRY_SMOOTHING = 5
+
+FEATURE_DTYPE = np.float32
+
+
+def country_of_column(column):
+    for prefix in COUNTRY_PREFIXES:
+        if column.startswith(prefix):
+            return column[len(prefix):]
+    return None
+
+
+# ==========================
+# COUNTRY ENCODING
+# ==========================
+def fit_country_encoding(df, smoothing=COUNTRY_SMOOTHING):
+    """Smoothed mean target per country (m-estimate toward the global mean).
+
+    Fit on training rows only; unseen countries get the global mean.
+    """
+    stats = df.groupby(COUNTRY, observed=True)[TARGET].agg(["mean", "count"])
+    global_mean = float(df[TARGET].mean())
+    values = (stats["count"] * stats["mean"] + smoothing * global_mean) / (stats["count"] + smoothing)
+
+    return {
+        "global": global_mean,
+        "smoothing": smoothing,
+        "countries": {str(country): float(value) for country, value in values.items()},
+    }
+
+
+def past_country_means(df, smoothing=COUNTRY_SMOOTHING):
+    """COUNTRY_MEAN for every training row from earlier years only.
+
+    Same m-estimate as fit_country_encoding, but each row sees only the
+    targets of years before its own, so its target never leaks into its
+    feature. Forecasts use the encoding fit on all history, which is
+    likewise earlier than every forecast year. df must be sorted by
+    country then year.
+    """
+    target = df[TARGET]
+    known = target.notna()
+
+    by_year = pd.DataFrame({"sum": target.fillna(0), "count": known}).groupby(df["Year"]).sum().sort_index()
+    before = by_year.cumsum().shift(1)
+    global_mean = (before["sum"] / before["count"]).reindex(df["Year"]).to_numpy()
+
+    grouped = pd.DataFrame({"sum": target.fillna(0), "count": known.astype(int)}).groupby(df[COUNTRY], observed=True)
+    country_sum = (grouped["sum"].cumsum() - target.fillna(0)).to_numpy()
+    country_count = (grouped["count"].cumsum() - known.astype(int)).to_numpy()
+
+    return (country_sum + smoothing * global_mean) / (country_count + smoothing)
+
+
+def encode_countries(countries, encoding):
+    return (
+        pd.Series(np.asarray(countries, dtype=object))
+        .map(encoding["countries"])
+        .fillna(encoding["global"])
+        .to_numpy(dtype=float)
+    )
+
+
+def target_encoded_features(forecast_features):
+    # Same features with the one-hot country columns replaced by COUNTRY_MEAN
+    return [c for c in forecast_features if country_of_column(c) is None and c != COUNTRY_MEAN] + [COUNTRY_MEAN]
+
+
+def one_hot_features(forecast_features, countries):
+    # Same features with one Country_orig_* column per country
+    kept = [c for c in forecast_features if country_of_column(c) is None and c != COUNTRY_MEAN]
+    return kept + [f"Country_orig_{country}" for country in sorted(countries)]
+
+
+def write_country_encoding(encoding, path=COUNTRY_ENCODING_PATH):
+    with open(path, "w") as f:
+        json.dump(encoding, f, indent=2, sort_keys=True)
+
+
+def load_country_encoding(path=COUNTRY_ENCODING_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# ==========================
+# SHARED BUILDING BLOCKS
+# ==========================
+def base_matrix(rows, countries, forecast_features, dtype=FEATURE_DTYPE, encoding=None):
+    """Static part of the feature matrix: exogenous indicators taken from
+    `rows` and the country columns (Country_* / Country_orig_* one-hot, or
+    COUNTRY_MEAN from `encoding`).
+    Lag, rolling and time columns are left at zero for fill_dynamic()."""
+    countries = np.asarray(countries, dtype=object)
+    X = np.zeros((len(countries), len(forecast_features)), dtype=dtype)
+
+    for j, column in enumerate(forecast_features):
+        dummy_country = country_of_column(column)
+
+        if dummy_country is not None:
+            X[:, j] = countries == dummy_country
+
+        elif column == COUNTRY_MEAN:
+            if encoding is None:
+                raise ValueError(f"{COUNTRY_MEAN} needs a country encoding ({COUNTRY_ENCODING_PATH})")
+            X[:, j] = encode_countries(countries, encoding)
+
+        elif column not in DYNAMIC_COLUMNS and column in rows.columns:
+            X[:, j] = pd.to_numeric(rows[column], errors="coerce").fillna(0).to_numpy()
+
+    return X
+
+
+def fill_dynamic(X, forecast_features, target_window, water_window, years, min_year):
+    """Write the lag/rolling/time features in place.
+
+    target_window holds the three target values before each row's year
+    (oldest first, NaN where unavailable); water_window the two water
+    access values before it. Training and serving both go through here.
+    """
+    column_index = {c: j for j, c in enumerate(forecast_features)}
+    values = {
+        LAG1: target_window[:, -1],
+        LAG2: target_window[:, -2],
+        ROLL3: np.nanmean(target_window, axis=1),
+        WATER_LAG1: water_window[:, -1],
+        WATER_LAG2: water_window[:, -2],
+        TIME_INDEX: np.asarray(years) - min_year,
+    }
+    for name, column_values in values.items():
+        if name in column_index:
+            X[:, column_index[name]] = column_values
+    return X
+
+
+# ==========================
+# TRAINING: EVERY COUNTRY-YEAR
+# ==========================
+def history_windows(df):
+    # One groupby pass: previous three targets and previous two water values per row
+    grouped = df.groupby(COUNTRY, sort=False, observed=True)
+    target_shift = [grouped[TARGET].shift(k) for k in (3, 2, 1)]
+    water_shift = [grouped[WATER].shift(k) for k in (2, 1)]
+
+    target_window = np.column_stack([s.to_numpy(dtype=float) for s in target_shift])
+    water_window = np.column_stack([s.to_numpy(dtype=float) for s in water_shift])
+    return target_window, water_window
+
+
+def build_training_matrix(df, forecast_features, min_year=None, dtype=FEATURE_DTYPE, encoding=None):
+    """Feature matrix for every country-year with two prior years of history.
+
+    With COUNTRY_MEAN, encoding supplies the smoothing; each row's value
+    comes from earlier years (past_country_means).
+
+    Returns (X, y, keys): X is a dense matrix in forecast_features order,
+    y the target and keys a (Country_orig, Year) frame aligned with X.
+    """
+    df = df.sort_values([COUNTRY, "Year"], kind="stable").reset_index(drop=True)
+    if min_year is None:
+        min_year = df["Year"].min()
+
+    target_window, water_window = history_windows(df)
+
+    X = base_matrix(df, df[COUNTRY].astype(str), forecast_features, dtype, encoding)
+    fill_dynamic(X, forecast_features, target_window, water_window, df["Year"].to_numpy(), min_year)
+
+    # Training rows get the country encoding from earlier years only;
+    # encoding fit on these same rows would leak each row's target
+    if COUNTRY_MEAN in forecast_features:
+        past = past_country_means(df, encoding["smoothing"])
+        X[:, list(forecast_features).index(COUNTRY_MEAN)] = np.where(np.isnan(past), encoding["global"], past)
+
+    # Rows without lag2 history cannot be used
+    usable = ~np.isnan(target_window[:, -2]) & ~np.isnan(water_window[:, -2])
+
+    keys = df.loc[usable, [COUNTRY, "Year"]].reset_index(drop=True)
+    return X[usable], df.loc[usable, TARGET].to_numpy(), keys
+
+
+# ==========================
+# SERVING: NEXT STEP PER COUNTRY
+# ==========================
+def serving_state(df):
+    """Last-known state per country for recursive forecasting.
+
+    Returns (last_rows, target_window, water_window) where the windows end
+    at each country's last observed year. Countries with fewer than two
+    observations are dropped.
+    """
+    df = df.sort_values([COUNTRY, "Year"], kind="stable")
+    counts = df.groupby(COUNTRY, observed=True)["Year"].transform("size")
+    df = df[counts >= 2]
+
+    grouped = df.groupby(COUNTRY, sort=True, observed=True)
+    tail = grouped.tail(3)
+    position = tail.groupby(COUNTRY, observed=True).cumcount(ascending=False)
+
+    last_rows = grouped.tail(1).set_index(COUNTRY)
+
+    def window(column, width):
+        return (
+            tail.assign(position=position)
+            .pivot(index=COUNTRY, columns="position", values=column)
+            .reindex(index=last_rows.index, columns=list(range(width - 1, -1, -1)))
+            .to_numpy(dtype=float)
+        )
+
+    return last_rows, window(TARGET, 3), window(WATER, 2)
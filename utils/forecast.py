@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from utils.features import (
+    COUNTRY,
+    TARGET,
+    base_matrix,
+    fill_dynamic,
+    serving_state,
+)
+from utils.intervals import predict_interval
+
+FORECAST_END_YEAR = 2035
+
+
+# ==========================
+# RECURSIVE FORECAST
+# ==========================
+def recursive_forecast(model, forecast_df, forecast_features,
+                       end_year=FORECAST_END_YEAR, countries=None, quantiles=None, encoding=None):
+    """Forecast every country from its last observed year up to end_year.
+
+    Each step predicts all countries in one batched call, then rolls the
+    lag1/lag2/roll3 features forward using the new predictions.
+    Returns a long DataFrame with one row per country and forecast year.
+
+    With quantiles, each step also reports quantiles of the per-tree
+    predictions (columns q05, q95, ...). They reflect the spread of the
+    trees at that step given the rolled-forward lags, not accumulated
+    error across steps.
+
+    encoding is the country encoding for models trained on COUNTRY_MEAN
+    instead of one-hot country columns (see utils.features).
+    """
+    df = forecast_df
+    if countries is not None:
+        df = df[df[COUNTRY].isin(countries)]
+
+    min_year = forecast_df["Year"].min()
+
+    last_rows, target_window, water_window = serving_state(df)
+
+    if last_rows.empty:
+        return pd.DataFrame(columns=[COUNTRY, "Year", "horizon", TARGET])
+
+    last_year = last_rows["Year"].to_numpy()
+    base = base_matrix(last_rows, last_rows.index.astype(str), forecast_features, encoding=encoding)
+
+    n_steps = int(end_year - last_year.min())
+    results = []
+
+    for step in range(1, n_steps + 1):
+
+        year = last_year + step
+
+        X = fill_dynamic(base.copy(), forecast_features, target_window, water_window, year, min_year)
+        X = pd.DataFrame(X, columns=forecast_features)
+
+        step_result = pd.DataFrame({
+            COUNTRY: last_rows.index,
+            "Year": year,
+            "horizon": step,
+        })
+
+        if quantiles:
+            bands = predict_interval(model, X, quantiles)
+            preds = bands["prediction"].to_numpy()
+            step_result[TARGET] = preds
+            for column in bands.columns[1:]:
+                step_result[column] = bands[column].to_numpy()
+        else:
+            preds = model.predict(X)
+            step_result[TARGET] = preds
+
+        results.append(step_result)
+
+        # Roll the state forward; water access is held at its last value
+        target_window = np.column_stack([target_window[:, 1:], preds])
+        water_window = np.column_stack([water_window[:, 1:], water_window[:, -1]])
+
+    forecast = pd.concat(results, ignore_index=True)
+    forecast = forecast[forecast["Year"] <= end_year]
+
+    return forecast.sort_values([COUNTRY, "Year"]).reset_index(drop=True)
@@ -0,0 +1,102 @@
+import hashlib
+import os
+
+from utils.forecast import COUNTRY, TARGET
+
+FORECAST_TABLE_PATH = "models/forecast/forecast_table.parquet"
+
+# Files the precomputed forecasts depend on. Both the CSV and the Parquet
+# store are hashed: the store is read from the CSV when it is stale, so
+# an edited CSV must also make the table stale
+FORECAST_INPUTS = [
+    "dataset/forecast_dataset.csv",
+    "dataset/forecast_dataset.parquet",
+    "models/forecast/rf_forecast_model.pkl",
+    "models/forecast/forecast_feature_columns.pkl",
+    "models/forecast/country_encoding.json",
+]
+
+REQUIRED_INPUTS = FORECAST_INPUTS[:4]
+
+HASH_KEY = b"inputs_sha256"
+
+
+# ==========================
+# CONTENT HASH
+# ==========================
+def inputs_hash(paths=FORECAST_INPUTS):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        # Optional inputs (the country encoding) may not exist
+        if not os.path.exists(path) and path not in REQUIRED_INPUTS:
+            continue
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+# ==========================
+# WRITE
+# ==========================
+def write_forecast_table(forecast, content_hash, path=FORECAST_TABLE_PATH):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    quantile_columns = [c for c in forecast.columns if c.startswith("q") and c[1:].isdigit()]
+
+    table = pa.Table.from_pandas(
+        forecast[[COUNTRY, "Year", "horizon", TARGET, *quantile_columns]], preserve_index=False
+    )
+    metadata = dict(table.schema.metadata or {})
+    metadata[HASH_KEY] = content_hash.encode()
+
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+# ==========================
+# LOOKUP
+# ==========================
+class ForecastTable:
+
+    def __init__(self, forecast, content_hash):
+        self.content_hash = content_hash
+        self.frame = forecast
+        self.values = {
+            (c, int(y)): float(v)
+            for c, y, v in zip(forecast[COUNTRY], forecast["Year"], forecast[TARGET])
+        }
+        # (country, year) -> forecast path up to that year, as a view
+        self.paths = {}
+        for c, g in forecast.sort_values("Year").groupby(COUNTRY, observed=True):
+            g = g.reset_index(drop=True)
+            for i, year in enumerate(g["Year"]):
+                self.paths[(c, int(year))] = g.iloc[: i + 1]
+
+    def lookup(self, country, year):
+        return self.values.get((country, int(year)))
+
+    def path(self, country, until_year):
+        return self.paths.get((country, int(until_year)))
+
+
+def load_forecast_table(path=FORECAST_TABLE_PATH):
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(path):
+        return None
+
+    table = pq.read_table(path)
+    content_hash = (table.schema.metadata or {}).get(HASH_KEY, b"").decode()
+
+    return ForecastTable(table.to_pandas(), content_hash)
+
+
+def is_fresh(forecast_table, paths=FORECAST_INPUTS):
+    if forecast_table is None:
+        return False
+    try:
+        return forecast_table.content_hash == inputs_hash(paths)
+    except FileNotFoundError:
+        return False
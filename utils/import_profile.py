@@ -0,0 +1,128 @@
+import argparse
+import ast
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+APP_PATH = "app.py"
+
+# Imported while a page renders, after the module-level imports
+PAGE_IMPORTS = {
+    "ML Prediction": ["plotly.express"],
+    "ML Forecasting": ["plotly.express"],
+}
+
+
+# ==========================
+# PROBES
+# ==========================
+def top_level_imports(path=APP_PATH):
+    # Module-level import statements of a script, as source
+    with open(path) as f:
+        source = f.read()
+
+    tree = ast.parse(source)
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def page_probe(page, path=APP_PATH):
+    """Code that imports what the dashboard imports to render page.
+
+    None is the process start (module-level imports only); a page name
+    adds that page's artifacts and render-time imports.
+    """
+    code = top_level_imports(path)
+    if page is None:
+        return code
+
+    lines = [
+        code,
+        "from utils.artifacts import ArtifactRegistry, PAGE_ARTIFACTS",
+        "registry = ArtifactRegistry()",
+        f"for name in PAGE_ARTIFACTS[{page!r}]:",
+        "    registry.try_get(name)",
+    ]
+    lines += [f"import {module}" for module in PAGE_IMPORTS.get(page, [])]
+    return "\n".join(lines)
+
+
+def run_probe(code):
+    # Wall time of a fresh interpreter running code, in seconds
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+# ==========================
+# PER-MODULE COST
+# ==========================
+def profile_imports(code):
+    """Per-module import cost of code, from python -X importtime.
+
+    Returns a DataFrame with module, self_ms, cumulative_ms and depth
+    (0 for modules imported directly by code).
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-W", "ignore", "-c", code],
+        check=True, capture_output=True, text=True,
+    )
+
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+        })
+    return pd.DataFrame(rows)
+
+
+def by_package(profile):
+    # Self time summed per top-level package
+    packages = profile["module"].str.split(".").str[0]
+    return (
+        profile.assign(package=packages)
+        .groupby("package")["self_ms"]
+        .agg(["sum", "count"])
+        .rename(columns={"sum": "self_ms", "count": "modules"})
+        .sort_values("self_ms", ascending=False)
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report per-module import cost of the dashboard.")
+    parser.add_argument("--page", choices=sorted(PAGE_IMPORTS), default=None,
+                        help="Also load this page's artifacts and render-time imports")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    startup = profile_imports(page_probe(None))
+    profile = startup if args.page is None else profile_imports(page_probe(args.page))
+
+    if args.page is not None:
+        # Only what the page adds on top of process start
+        profile = profile[~profile["module"].isin(startup["module"])]
+
+    label = args.page or "startup"
+    print(f"{label}: {len(profile)} modules, {profile['self_ms'].sum():.1f} ms importing")
+    print(f"cold interpreter wall time: {run_probe(page_probe(args.page)) * 1000:.1f} ms\n")
+
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(by_package(profile).head(args.top).round(1).to_string())
+        print()
+        slowest = profile.sort_values("cumulative_ms", ascending=False)
+        print(slowest.head(args.top).round(1).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
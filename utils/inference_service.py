@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from utils.artifacts import ArtifactRegistry
+from utils.forecast import recursive_forecast, COUNTRY, TARGET
+from utils.surrogate import PREDICTION_MODES, serving_model
+
+log = logging.getLogger("inference_service")
+
+MAX_BATCH = 512
+MAX_WAIT_MS = 5.0
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+# ==========================
+# MICRO-BATCHING
+# ==========================
+class MicroBatcher:
+    """Coalesces concurrent predict requests into one batched call.
+
+    Requests queue up as (rows, future); the worker takes the first one,
+    keeps collecting until MAX_BATCH rows or MAX_WAIT_MS have passed, then
+    runs a single predict in a thread so the event loop stays responsive.
+    """
+
+    def __init__(self, predict_fn, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batch_sizes = deque(maxlen=10_000)
+        self.batch_requests = deque(maxlen=10_000)
+        self.batch_seconds = deque(maxlen=10_000)
+        self.total_rows = 0
+
+    async def submit(self, X):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((X, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            items = [await self.queue.get()]
+            n_rows = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while n_rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                n_rows += len(item[0])
+
+            X = np.vstack([rows for rows, _ in items])
+            start = time.perf_counter()
+
+            try:
+                preds = await loop.run_in_executor(None, self.predict_fn, X)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batch_seconds.append(time.perf_counter() - start)
+            self.batch_sizes.append(n_rows)
+            self.batch_requests.append(len(items))
+            self.total_rows += n_rows
+
+            offset = 0
+            for rows, future in items:
+                if not future.done():
+                    future.set_result(preds[offset:offset + len(rows)])
+                offset += len(rows)
+
+    def stats(self):
+        sizes = np.array(self.batch_sizes) if self.batch_sizes else np.zeros(1)
+        requests = np.array(self.batch_requests) if self.batch_requests else np.zeros(1)
+        seconds = np.array(self.batch_seconds) if self.batch_seconds else np.zeros(1)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "batches": len(self.batch_sizes),
+            "rows": self.total_rows,
+            "batch_rows_mean": float(sizes.mean()),
+            "batch_rows_p50": float(np.percentile(sizes, 50)),
+            "batch_rows_max": int(sizes.max()),
+            "batch_requests_mean": float(requests.mean()),
+            "predict_ms_p50": float(np.percentile(seconds, 50) * 1000),
+            "predict_ms_p99": float(np.percentile(seconds, 99) * 1000),
+        }
+
+
+# ==========================
+# SERVICE
+# ==========================
+class InferenceService:
+
+    def __init__(self, registry=None, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, mode=None):
+        registry = registry or ArtifactRegistry()
+        if mode is None:
+            mode = registry.get("config").get("serving", {}).get("prediction_mode", "full")
+
+        # Everything is loaded once, before the server accepts connections
+        self.schema = registry.get("input_schema")
+        self.feature_columns = list(self.schema.columns)
+        model, _, self.mode = serving_model(registry, mode)
+
+        def predict(X):
+            return model.predict(pd.DataFrame(X, columns=self.feature_columns))
+
+        self.batcher = MicroBatcher(predict, max_batch, max_wait_ms)
+        self.forecasts = self.load_forecasts(registry)
+        self.started = time.time()
+
+    @staticmethod
+    def load_forecasts(registry):
+        table = registry.try_get("forecast_table")
+        if table is not None:
+            return table.values
+
+        model = registry.try_get("forecast_model")
+        if model is None:
+            log.warning("Forecast model not found; /forecast is disabled")
+            return None
+
+        forecast = recursive_forecast(
+            model, registry.get("forecast_df"), registry.get("forecast_features"),
+            encoding=registry.try_get("country_encoding"),
+        )
+        return {
+            (c, int(y)): float(v)
+            for c, y, v in zip(forecast[COUNTRY], forecast["Year"], forecast[TARGET])
+        }
+
+    def rows_to_matrix(self, rows):
+        if not isinstance(rows, list) or not rows:
+            raise BadRequest("'rows' must be a non-empty list of feature objects")
+
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                raise BadRequest(f"row {i} must be an object")
+
+        # Same rules as the dashboard form: missing, non-numeric (including
+        # NaN/Infinity, which json.loads accepts) and out-of-range values
+        validation = self.schema.validate(rows)
+        if not validation.valid.all():
+            i = int(np.flatnonzero(~validation.valid)[0])
+            problems = ", ".join(f"{feature} ({error})" for feature, error in validation.row_errors(i))
+            raise BadRequest(f"row {i} has invalid features: {problems}")
+        return validation.X
+
+    async def handle_predict(self, body):
+        rows = body.get("rows") if "rows" in body else [body.get("features")]
+        preds = await self.batcher.submit(self.rows_to_matrix(rows))
+        return {"predictions": [float(p) for p in preds]}
+
+    async def handle_forecast(self, body):
+        if self.forecasts is None:
+            raise BadRequest("forecast model is not available")
+
+        requests = body["requests"] if "requests" in body else [body]
+        if not isinstance(requests, list) or not requests:
+            raise BadRequest("'requests' must be a non-empty list of forecast objects")
+
+        results = []
+        for i, item in enumerate(requests):
+            if not isinstance(item, dict):
+                raise BadRequest(f"request {i} must be an object")
+            try:
+                key = (item["country"], int(item["year"]))
+            except (KeyError, TypeError, ValueError):
+                raise BadRequest("each forecast request needs 'country' and 'year'")
+            results.append({"country": key[0], "year": key[1], "forecast": self.forecasts.get(key)})
+        return {"forecasts": results}
+
+    def handle_stats(self):
+        return {
+            "uptime_seconds": time.time() - self.started,
+            "mode": self.mode,
+            "predict": self.batcher.stats(),
+        }
+
+    async def dispatch(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/stats":
+            return 200, self.handle_stats()
+
+        routes = {"/predict": self.handle_predict, "/forecast": self.handle_forecast}
+        if path not in routes:
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        try:
+            return 200, await routes[path](payload)
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+
+    # ==========================
+    # HTTP/1.1 (keep-alive)
+    # ==========================
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                try:
+                    method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+
+                if length < 0:
+                    status, payload = 400, {"error": "invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.dispatch(method, urlsplit(target).path, body)
+                    except Exception:
+                        log.exception("Request failed")
+                        status, payload = 500, {"error": "internal error"}
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port):
+        worker = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        log.info("Serving on http://%s:%d", host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP JSON inference service with request micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--mode", choices=PREDICTION_MODES, default=None,
+                        help="Full model or distilled surrogate (default: config.yaml)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    service = InferenceService(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, mode=args.mode)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
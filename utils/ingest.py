@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+SOURCES_PATH = "dataset/sources.yaml"
+INGEST_CACHE_DIR = "dataset/ingest_cache"
+STATE_FILE = "state.json"
+
+# Rows per CSV chunk; peak memory scales with this, not the file size
+CHUNK_ROWS = 200_000
+
+KEYS = ["country", "year", "column"]
+
+
+# ==========================
+# SPEC
+# ==========================
+def load_spec(path=SOURCES_PATH):
+    import yaml
+
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def source_indicators(spec):
+    # source -> {indicator code/name in the bulk file: dataset column}
+    by_source = {name: {} for name in spec["sources"]}
+    for column, entry in spec["columns"].items():
+        by_source[entry["source"]][str(entry["indicator"])] = column
+    return by_source
+
+
+def source_fingerprint(name, source, indicators, spec):
+    # Size + mtime of the bulk file plus everything that decides which rows
+    # it contributes; any change re-reads that source only
+    stat = os.stat(source["path"])
+    settings = {
+        "source": source,
+        "indicators": indicators,
+        "countries": spec["countries"],
+        "aliases": spec.get("aliases", {}).get(name),
+        "years": spec.get("years"),
+    }
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "settings": hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest(),
+    }
+
+
+# ==========================
+# STREAMING READ
+# ==========================
+def parse_years(values):
+    # "2001", or "2000-2002" for FAO 3-year averages (assigned to the middle year)
+    parts = values.astype(str).str.strip().str.split("-", n=1, expand=True)
+    start = pd.to_numeric(parts[0], errors="coerce")
+    if parts.shape[1] == 1:
+        return start
+    end = pd.to_numeric(parts[1], errors="coerce")
+    return ((start + end) // 2).where(end.notna(), start)
+
+
+def parse_values(values):
+    # FAO reports some small prevalences as "<2.5"
+    return pd.to_numeric(values.astype(str).str.strip().str.lstrip("<"), errors="coerce")
+
+
+def source_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Yield (country, indicator, year, value) string frames from a bulk CSV.
+
+    layout "long" has one row per country/indicator/year (FAOSTAT
+    normalized exports); "wide" has one column per year (World Bank WDI).
+    Only the needed columns are parsed.
+    """
+    country, indicator = source["country"], source["indicator"]
+    read = {"chunksize": chunk_rows, "dtype": str, "encoding": source.get("encoding", "utf-8")}
+
+    if source.get("layout", "long") == "long":
+        year, value = source.get("year", "Year"), source.get("value", "Value")
+        for chunk in pd.read_csv(source["path"], usecols=[country, indicator, year, value], **read):
+            yield chunk.rename(columns={country: "country", indicator: "indicator", year: "year", value: "value"})
+        return
+
+    header = pd.read_csv(source["path"], nrows=0, encoding=read["encoding"]).columns
+    year_columns = [c for c in header if c.strip().isdigit()]
+    for chunk in pd.read_csv(source["path"], usecols=[country, indicator, *year_columns], **read):
+        yield chunk.melt(id_vars=[country, indicator], var_name="year", value_name="value").rename(
+            columns={country: "country", indicator: "indicator"}
+        )
+
+
+class PivotAccumulator:
+    """Running sum and count per (country, year, column).
+
+    Its size is bounded by countries x years x columns, so memory does not
+    grow with the number of rows streamed. Several rows for one cell
+    (e.g. monthly price indices) are averaged.
+    """
+
+    def __init__(self):
+        self.parts = None
+
+    def add(self, rows):
+        self.add_parts(rows.groupby(KEYS)["value"].agg(["sum", "count"]))
+
+    def add_parts(self, parts):
+        if parts is None or parts.empty:
+            return
+        self.parts = parts if self.parts is None else self.parts.add(parts, fill_value=0)
+
+    def to_frame(self):
+        if self.parts is None:
+            return pd.DataFrame(columns=[*KEYS, "sum", "count"])
+        return self.parts.reset_index()
+
+    def wide(self):
+        """Country-year rows with one column per indicator (mean per cell)."""
+        if self.parts is None:
+            return pd.DataFrame(columns=["Country", "Year"])
+        values = (self.parts["sum"] / self.parts["count"]).rename("value").reset_index()
+        wide = values.pivot(index=["country", "year"], columns="column", values="value")
+        wide.columns.name = None
+        return wide.reset_index().rename(columns={"country": "Country", "year": "Year"})
+
+
+def read_source(source, indicators, countries, aliases=None, years=None, chunk_rows=CHUNK_ROWS):
+    """Stream one bulk file into a PivotAccumulator.
+
+    Returns (accumulator, rows_read, rows_kept).
+    """
+    countries = set(countries)
+    accumulator = PivotAccumulator()
+    rows_read = rows_kept = 0
+
+    for chunk in source_chunks(source, chunk_rows):
+        rows_read += len(chunk)
+
+        chunk = chunk[chunk["indicator"].isin(indicators.keys())]
+        if aliases:
+            chunk = chunk.assign(country=chunk["country"].replace(aliases))
+        chunk = chunk[chunk["country"].isin(countries)]
+        if chunk.empty:
+            continue
+
+        rows = pd.DataFrame({
+            "country": chunk["country"],
+            "year": parse_years(chunk["year"]),
+            "column": chunk["indicator"].map(indicators),
+            "value": parse_values(chunk["value"]),
+        }).dropna()
+        if years is not None:
+            rows = rows[rows["year"].between(years[0], years[1])]
+
+        rows["year"] = rows["year"].astype(int)
+        rows_kept += len(rows)
+        accumulator.add(rows)
+
+    return accumulator, rows_read, rows_kept
+
+
+# ==========================
+# INCREMENTAL INGEST
+# ==========================
+def read_state(cache_dir):
+    path = os.path.join(cache_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_state(state, cache_dir):
+    path = os.path.join(cache_dir, STATE_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def ingest(spec, cache_dir=INGEST_CACHE_DIR, chunk_rows=CHUNK_ROWS, force=False):
+    """Build the country-year panel from every source in the spec.
+
+    Each source's partial sums are cached in cache_dir with its
+    fingerprint; a source is only re-read when its file or settings
+    changed. Returns (panel, stats) where stats has one row per source.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    state = read_state(cache_dir)
+    aliases = spec.get("aliases", {})
+    years = spec.get("years")
+
+    panel = PivotAccumulator()
+    stats = []
+
+    for name, indicators in source_indicators(spec).items():
+        source = spec["sources"][name]
+        fingerprint = source_fingerprint(name, source, indicators, spec)
+        partial_path = os.path.join(cache_dir, f"{name}.parquet")
+
+        start = time.perf_counter()
+        cached = not force and state.get(name) == fingerprint and os.path.exists(partial_path)
+
+        if cached:
+            panel.add_parts(pd.read_parquet(partial_path).set_index(KEYS))
+            rows_read = rows_kept = None
+        else:
+            accumulator, rows_read, rows_kept = read_source(
+                source, indicators, spec["countries"], aliases.get(name), years, chunk_rows
+            )
+            accumulator.to_frame().to_parquet(partial_path, index=False)
+            state[name] = fingerprint
+            panel.add_parts(accumulator.parts)
+
+        stats.append({
+            "source": name,
+            "cached": cached,
+            "rows_read": rows_read,
+            "rows_kept": rows_kept,
+            "seconds": time.perf_counter() - start,
+        })
+
+    write_state(state, cache_dir)
+    return panel.wide(), pd.DataFrame(stats)
+
+
+# ==========================
+# DATASETS
+# ==========================
+def build_datasets(panel, features, target, country_column="Country_orig"):
+    """(model_df, predict_df) from the wide panel.
+
+    model_df has the forecast_dataset.csv layout (every country-year with
+    a target value); predict_df only the rows with every feature present.
+    """
+    panel = panel.reindex(columns=["Year", "Country", *features, target])
+    model_df = panel[panel[target].notna()].sort_values(["Country", "Year"]).reset_index(drop=True)
+    model_df[country_column] = model_df["Country"]
+
+    predict_df = model_df.dropna(subset=features).reset_index(drop=True)
+    return model_df, predict_df
+
+
+def read_dataset(path):
+    # Training data is written as Parquet by the ingest step; CSV still works
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
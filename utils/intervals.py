@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+DEFAULT_QUANTILES = (0.05, 0.95)
+CHUNK_ROWS = 10_000
+
+
+def quantile_column(q):
+    return f"q{round(q * 100):02d}"
+
+
+# ==========================
+# PER-TREE OUTPUTS
+# ==========================
+def split_model(model):
+    # (preprocessing or None, forest) for a Pipeline or a bare forest
+    steps = getattr(model, "steps", None)
+    if steps is None:
+        return None, model
+    if len(steps) == 1:
+        return None, steps[-1][1]
+    return model[:-1], steps[-1][1]
+
+
+def per_tree_predictions(model, X, n_jobs=-1):
+    """Return every tree's prediction as a (n_trees, n_rows) array.
+
+    Trees are evaluated in parallel threads; sklearn's tree predict
+    releases the GIL. Compact forests (utils.compact_forest) are
+    evaluated directly.
+    """
+    if hasattr(model, "predict_per_tree"):
+        return model.predict_per_tree(X)
+
+    from joblib import Parallel, delayed
+
+    preprocessing, forest = split_model(model)
+    if preprocessing is not None:
+        X = preprocessing.transform(X)
+
+    # Trees are fitted on float32 arrays
+    X = np.asarray(X, dtype=np.float32)
+
+    outputs = Parallel(n_jobs=n_jobs, prefer="threads")(
+        delayed(tree.predict)(X, check_input=False) for tree in forest.estimators_
+    )
+    return np.vstack(outputs)
+
+
+# ==========================
+# QUANTILES
+# ==========================
+def predict_interval(model, X, quantiles=DEFAULT_QUANTILES, chunk_rows=CHUNK_ROWS, n_jobs=-1):
+    """Point prediction plus quantiles of the per-tree predictions.
+
+    This is the spread of the individual trees rather than a full
+    quantile regression forest (which weights leaf training samples), but
+    it needs nothing beyond the fitted forest. Rows are processed in
+    chunks so the (n_trees, chunk) array bounds memory. Returns a
+    DataFrame with a "prediction" column and one column per quantile.
+    """
+    n_rows = len(X)
+    out = np.empty((n_rows, len(quantiles) + 1))
+
+    for start in range(0, n_rows, chunk_rows):
+        chunk = X.iloc[start:start + chunk_rows] if hasattr(X, "iloc") else X[start:start + chunk_rows]
+        per_tree = per_tree_predictions(model, chunk, n_jobs)
+
+        out[start:start + len(per_tree[0]), 0] = per_tree.mean(axis=0)
+        out[start:start + len(per_tree[0]), 1:] = np.quantile(per_tree, quantiles, axis=0).T
+
+    index = X.index if hasattr(X, "index") else None
+    return pd.DataFrame(out, columns=["prediction"] + [quantile_column(q) for q in quantiles], index=index)
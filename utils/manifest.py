@@ -0,0 +1,117 @@
+import datetime
+import json
+import os
+
+MANIFEST_PATH = "models/manifest.json"
+
+# model -> (artifact holding the fitted model, artifact holding its metrics)
+MODELS = {
+    "prediction": ("pipeline", "prediction_metrics"),
+    "forecast": ("forecast_model", "forecast_metrics"),
+}
+
+
+# ==========================
+# METRICS
+# ==========================
+def prediction_metrics(metrics):
+    # prediction_metrics.pkl is a one-row DataFrame from the training notebook
+    row = metrics.iloc[0]
+    return {
+        "r_square_score": float(row["R Square Score"]),
+        "rmse": float(row["Root Mean Square Error"]),
+        "avg_CV_score": float(row["Average CV score"]),
+    }
+
+
+def forecast_metrics(metrics):
+    return {name: float(value) for name, value in metrics.items()}
+
+
+METRIC_READERS = {
+    "prediction": prediction_metrics,
+    "forecast": forecast_metrics,
+}
+
+
+def describe_models(hashes, get_metrics):
+    """Version and metrics for each model.
+
+    hashes maps artifact name -> sha256; get_metrics(name) returns the
+    loaded metrics artifact or None. The version is the first 12 hex
+    digits of the model file's hash (None when the file is missing).
+    """
+    models = {}
+    for model, (artifact, metrics_artifact) in MODELS.items():
+        metrics = get_metrics(metrics_artifact)
+        if artifact not in hashes and metrics is None:
+            continue
+        models[model] = {
+            "artifact": artifact,
+            "version": hashes[artifact][:12] if artifact in hashes else None,
+            "metrics": METRIC_READERS[model](metrics) if metrics is not None else {},
+        }
+    return models
+
+
+# ==========================
+# BUILD
+# ==========================
+def build_manifest(artifacts, hash_file, load_metrics):
+    files = {}
+    for name, (path, _) in artifacts.items():
+        if not os.path.exists(path):
+            continue
+        stat = os.stat(path)
+        files[name] = {
+            "path": path,
+            "sha256": hash_file(path),
+            "size": stat.st_size,
+            "modified": datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc).isoformat(),
+        }
+
+    hashes = {name: entry["sha256"] for name, entry in files.items()}
+
+    def get_metrics(name):
+        return load_metrics(artifacts[name][0]) if name in files else None
+
+    return {
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "artifacts": files,
+        "models": describe_models(hashes, get_metrics),
+    }
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    # Written to a temporary file and renamed, so readers never see a
+    # partially written manifest
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# ==========================
+# LOAD
+# ==========================
+def manifest_stamp(path=MANIFEST_PATH):
+    # Cheap change check: (mtime, size), or None if there is no manifest
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def artifact_hashes(manifest):
+    if manifest is None:
+        return {}
+    return {name: entry["sha256"] for name, entry in manifest.get("artifacts", {}).items()}
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_SIZE = 10_000
+DEFAULT_MAX_AGE = 3600
+
+
+class PredictionCache:
+    """Bounded LRU cache of predictions, keyed on model hash + feature vector.
+
+    Feature vectors are canonicalized to float64 (optionally rounded to
+    `decimals` places, so near-identical inputs share an entry). Entries
+    expire after `max_age` seconds; the least recently used entry is
+    evicted once `max_size` is reached. A retrained model has a new
+    content hash, so its predictions never collide with stale ones.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, max_age=DEFAULT_MAX_AGE, decimals=None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.decimals = decimals
+
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def canonical(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if self.decimals is not None:
+            X = np.round(X, self.decimals)
+        # -0.0 and 0.0 must hash the same
+        return X + 0.0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, stored = entry
+            if now - stored > self.max_age:
+                del self.entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def predict(self, model, model_hash, X, feature_columns=None):
+        # Cached predictions for every row; misses go through one batched predict
+        if feature_columns is None and isinstance(X, pd.DataFrame):
+            feature_columns = list(X.columns)
+
+        values = self.canonical(X)
+        keys = [(model_hash, row.tobytes()) for row in values]
+
+        preds = np.empty(len(values))
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                preds[i] = cached
+
+        if missing:
+            X_missing = values[missing]
+            if feature_columns is not None:
+                X_missing = pd.DataFrame(X_missing, columns=feature_columns)
+
+            for i, value in zip(missing, model.predict(X_missing)):
+                preds[i] = value
+                self.put(keys[i], float(value))
+
+        return preds
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
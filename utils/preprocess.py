@@ -1,10 +1,179 @@
+import functools
+import json
+import os
+
+import numpy as np
 import pandas as pd
-import joblib
 
+FEATURE_COLUMNS_PATH = "models/prediction/feature_columns.pkl"
+SCHEMA_PATH = "models/prediction/input_schema.json"
+TRAINING_DATA_PATH = "dataset/forecast_dataset.csv"
+
+# Plausible range: the training min/max widened by this fraction of the
+# spread on each side (never below 0 for features that are never negative)
+RANGE_MARGIN = 0.5
+
+# Per-cell error flags
+MISSING = 1
+NOT_NUMERIC = 2
+OUT_OF_RANGE = 4
+
+ERROR_NAMES = {
+    MISSING: "missing",
+    NOT_NUMERIC: "not numeric",
+    OUT_OF_RANGE: "out of range",
+}
+
+
+# ==========================
+# SCHEMA
+# ==========================
+def build_schema(df, feature_columns, margin=RANGE_MARGIN):
+    """Column order plus plausible [low, high] per feature from training data."""
+    values = df[feature_columns].to_numpy(dtype=np.float64)
+    minimum = np.nanmin(values, axis=0)
+    maximum = np.nanmax(values, axis=0)
+    spread = maximum - minimum
+
+    low = np.where(minimum >= 0, np.maximum(minimum - margin * spread, 0), minimum - margin * spread)
+    high = maximum + margin * spread
+
+    return {
+        "margin": margin,
+        "features": [
+            {"name": name, "min": float(lo_seen), "max": float(hi_seen), "low": float(lo), "high": float(hi)}
+            for name, lo_seen, hi_seen, lo, hi in zip(feature_columns, minimum, maximum, low, high)
+        ],
+    }
+
+
+def write_schema(schema, path=SCHEMA_PATH):
+    with open(path, "w") as f:
+        json.dump(schema, f, indent=2)
+
+
+class Schema:
+
+    def __init__(self, columns, low=None, high=None):
+        self.columns = list(columns)
+        self.index = {name: j for j, name in enumerate(self.columns)}
+        self.low = np.full(len(self.columns), -np.inf) if low is None else np.asarray(low, dtype=np.float64)
+        self.high = np.full(len(self.columns), np.inf) if high is None else np.asarray(high, dtype=np.float64)
+
+    @classmethod
+    def from_dict(cls, schema):
+        features = schema["features"]
+        return cls(
+            [f["name"] for f in features],
+            [f["low"] for f in features],
+            [f["high"] for f in features],
+        )
+
+    def bounds(self, name):
+        j = self.index[name]
+        return self.low[j], self.high[j]
+
+    def validate(self, data):
+        """Validate a batch without raising.
+
+        data is a dict (one row), a list of dicts or a DataFrame. Returns
+        a Validation with the float64 matrix (NaN where a cell failed) and
+        a per-cell uint8 error mask of MISSING/NOT_NUMERIC/OUT_OF_RANGE.
+        """
+        if isinstance(data, dict):
+            data = [data]
+        if not isinstance(data, pd.DataFrame):
+            data = pd.DataFrame.from_records(data)
+
+        n_rows = len(data)
+        X = np.full((n_rows, len(self.columns)), np.nan)
+        errors = np.zeros((n_rows, len(self.columns)), dtype=np.uint8)
+
+        for j, name in enumerate(self.columns):
+            if name not in data.columns:
+                errors[:, j] = MISSING
+                continue
+
+            column = data[name]
+            if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+                values = column.to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(values)
+            else:
+                raw = column.astype("string").str.strip()
+                missing = (raw.isna() | (raw == "")).to_numpy(dtype=bool)
+                values = pd.to_numeric(raw.mask(missing), errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+
+            not_numeric = ~missing & ~np.isfinite(values)
+            errors[missing, j] |= MISSING
+            errors[not_numeric, j] |= NOT_NUMERIC
+            X[:, j] = np.where(missing | not_numeric, np.nan, values)
+
+        with np.errstate(invalid="ignore"):
+            out_of_range = (X < self.low) | (X > self.high)
+        errors[out_of_range] |= OUT_OF_RANGE
+
+        return Validation(self, X, errors, data.index)
+
+
+class Validation:
+
+    def __init__(self, schema, X, errors, index):
+        self.schema = schema
+        self.X = X
+        self.errors = errors
+        self.index = index
+        self.valid = ~errors.any(axis=1)
+
+    def frame(self):
+        # Coerced values in model column order (NaN where a cell failed)
+        return pd.DataFrame(self.X, columns=self.schema.columns, index=self.index)
+
+    def flagged(self, code):
+        # Boolean (n_rows, n_features) mask of one error type
+        return (self.errors & code).astype(bool)
+
+    def row_errors(self, i):
+        # [(feature, error name)] for row i
+        return [
+            (self.schema.columns[j], ERROR_NAMES[code])
+            for j in np.flatnonzero(self.errors[i])
+            for code in ERROR_NAMES
+            if self.errors[i, j] & code
+        ]
+
+    def summary(self):
+        # Rows affected per feature and error type
+        return pd.DataFrame(
+            {name: self.flagged(code).sum(axis=0) for code, name in ERROR_NAMES.items()},
+            index=self.schema.columns,
+        )
+
+
+def read_schema(path=SCHEMA_PATH, feature_columns_path=FEATURE_COLUMNS_PATH):
+    # Rebuilt from the training data if the schema file has not been written yet
+    if os.path.exists(path):
+        with open(path) as f:
+            return Schema.from_dict(json.load(f))
+
+    import joblib
+
+    feature_columns = joblib.load(feature_columns_path)
+    return Schema.from_dict(build_schema(pd.read_csv(TRAINING_DATA_PATH), feature_columns))
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema(path=SCHEMA_PATH):
+    # Read once per process
+    return read_schema(path)
+
+
+# ==========================
+# SINGLE ROW (UI)
+# ==========================
 def preprocess_input(user_input_dict):
 
-    # Load correct feature order
-    feature_columns = joblib.load("models/prediction/feature_columns.pkl")
+    # Feature order comes from the cached schema
+    feature_columns = load_schema().columns
 
     # Convert user input to DataFrame
     input_df = pd.DataFrame([user_input_dict])
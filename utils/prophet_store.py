@@ -0,0 +1,107 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+PROPHET_STORE_PATH = "models/forecast/prophet_store.arrow"
+
+STORE_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+INDEX_KEY = b"country_row_ranges"
+
+
+# ==========================
+# BUILD
+# ==========================
+def compact_frame(forecasts):
+    # Wide Prophet output (one row per country/ds) -> the four served columns
+    df = forecasts.reset_index() if "Country" not in forecasts.columns else forecasts
+    df = df[["Country", *STORE_COLUMNS]].sort_values(["Country", "ds"], kind="stable")
+    df = df.reset_index(drop=True)
+
+    df["ds"] = pd.to_datetime(df["ds"]).astype("datetime64[ns]")
+    for column in STORE_COLUMNS[1:]:
+        df[column] = df[column].astype(np.float64)
+    return df
+
+
+def country_ranges(countries):
+    values = countries.to_numpy()
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    stops = np.r_[starts[1:], len(values)]
+    return {str(values[start]): (int(start), int(stop)) for start, stop in zip(starts, stops)}
+
+
+def write_prophet_store(forecasts, path=PROPHET_STORE_PATH):
+    """Write ds/yhat/yhat_lower/yhat_upper for every country to one file.
+
+    Arrow IPC, uncompressed and written as a single record batch, so the
+    file can be memory-mapped and each column read as one NumPy view.
+    The country -> (start, stop) row index lives in the schema metadata;
+    the country column itself is not stored.
+    """
+    import pyarrow as pa
+
+    df = compact_frame(forecasts)
+
+    table = pa.Table.from_pandas(df[STORE_COLUMNS], preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[INDEX_KEY] = json.dumps(country_ranges(df["Country"])).encode()
+    table = table.replace_schema_metadata(metadata).combine_chunks()
+
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+
+    return df
+
+
+# ==========================
+# LOAD
+# ==========================
+class ProphetStore:
+    """Memory-mapped Prophet forecasts with a country row index.
+
+    country() returns a dict of NumPy views into the mapped file; nothing
+    is copied until a caller asks for a DataFrame with frame().
+    """
+
+    def __init__(self, columns, ranges, source=None):
+        self.columns = columns
+        self.ranges = ranges
+        self.countries = sorted(ranges)
+        # Keeps the memory map alive as long as the views are
+        self._source = source
+
+    def country(self, name):
+        start, stop = self.ranges.get(name, (0, 0))
+        return {column: values[start:stop] for column, values in self.columns.items()}
+
+    def frame(self, name):
+        return pd.DataFrame(self.country(name))
+
+    def __len__(self):
+        return len(self.columns["ds"])
+
+
+def load_prophet_store(path=PROPHET_STORE_PATH):
+    import pyarrow as pa
+
+    if not os.path.exists(path):
+        return None
+
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+
+    ranges = {
+        country: tuple(bounds)
+        for country, bounds in json.loads(table.schema.metadata[INDEX_KEY]).items()
+    }
+
+    columns = {}
+    for name in STORE_COLUMNS:
+        column = table.column(name)
+        chunk = column.chunk(0) if column.num_chunks else pa.array([], type=column.type)
+        columns[name] = chunk.to_numpy(zero_copy_only=True)
+
+    return ProphetStore(columns, ranges, source)
@@ -0,0 +1,133 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 8192
+
+# values are absolute feature values, or fractional changes from the base
+# value when relative=True (0.05 means +5%)
+Sweep = namedtuple("Sweep", ["feature", "values", "relative"])
+
+
+def pct_sweep(feature, low, high, steps):
+    return Sweep(feature, np.linspace(low, high, steps), True)
+
+
+def value_sweep(feature, values):
+    return Sweep(feature, np.asarray(values, dtype=float), False)
+
+
+# ==========================
+# BASE ROW
+# ==========================
+def base_row(store, country, year, feature_columns):
+    rows = store.country(country)
+    match = rows[rows["Year"] == year]
+    if match.empty:
+        raise ValueError(f"No data for {country} in {year}")
+    return match.iloc[0][feature_columns].astype(float)
+
+
+# ==========================
+# LAZY SCENARIO MATRIX
+# ==========================
+def grid_shape(sweeps):
+    return tuple(len(s.values) for s in sweeps)
+
+
+def iter_scenario_chunks(base, sweeps, feature_columns, chunk_rows=CHUNK_ROWS):
+    """Yield (start, X) for consecutive chunks of the full sweep grid.
+
+    Row i of the grid corresponds to np.unravel_index(i, grid_shape(sweeps));
+    only one chunk of the matrix exists at a time.
+    """
+    base = np.asarray(base[feature_columns], dtype=float)
+    shape = grid_shape(sweeps)
+    total = int(np.prod(shape))
+    column_index = {c: j for j, c in enumerate(feature_columns)}
+
+    for sweep in sweeps:
+        if sweep.feature not in column_index:
+            raise ValueError(f"Unknown feature: {sweep.feature}")
+
+    for start in range(0, total, chunk_rows):
+        stop = min(start + chunk_rows, total)
+        positions = np.unravel_index(np.arange(start, stop), shape)
+
+        X = np.tile(base, (stop - start, 1))
+        for sweep, position in zip(sweeps, positions):
+            j = column_index[sweep.feature]
+            values = np.asarray(sweep.values, dtype=float)[position]
+            X[:, j] = base[j] * (1 + values) if sweep.relative else values
+
+        yield start, X
+
+
+# ==========================
+# SCORING + SUMMARIES
+# ==========================
+def run_scenarios(model, base, sweeps, feature_columns, chunk_rows=CHUNK_ROWS):
+    """Score every combination of the sweeps with batched predict calls.
+
+    Returns a dict with the response array (grid-shaped), the baseline
+    prediction, summary statistics, best/worst settings and one marginal
+    response curve per swept feature.
+    """
+    shape = grid_shape(sweeps)
+    response = np.empty(int(np.prod(shape)))
+
+    for start, X in iter_scenario_chunks(base, sweeps, feature_columns, chunk_rows):
+        response[start:start + len(X)] = model.predict(pd.DataFrame(X, columns=feature_columns))
+
+    response = response.reshape(shape)
+    baseline = float(model.predict(pd.DataFrame([base[feature_columns].to_numpy()], columns=feature_columns))[0])
+
+    def settings(flat_index):
+        position = np.unravel_index(flat_index, shape)
+        return {s.feature: float(np.asarray(s.values)[p]) for s, p in zip(sweeps, position)}
+
+    marginals = {}
+    for axis, sweep in enumerate(sweeps):
+        others = tuple(a for a in range(len(sweeps)) if a != axis)
+        marginals[sweep.feature] = pd.DataFrame({
+            "value": sweep.values,
+            "mean": response.mean(axis=others) if others else response,
+            "min": response.min(axis=others) if others else response,
+            "max": response.max(axis=others) if others else response,
+        })
+
+    return {
+        "response": response,
+        "baseline": baseline,
+        "summary": {
+            "scenarios": response.size,
+            "mean": float(response.mean()),
+            "std": float(response.std()),
+            "min": float(response.min()),
+            "p05": float(np.percentile(response, 5)),
+            "p50": float(np.percentile(response, 50)),
+            "p95": float(np.percentile(response, 95)),
+            "max": float(response.max()),
+        },
+        "best": settings(int(response.argmin())),
+        "worst": settings(int(response.argmax())),
+        "marginals": marginals,
+    }
+
+
+def response_surface(result, sweeps, x_feature, y_feature):
+    # Mean response over two swept features, averaged over the rest
+    axes = [s.feature for s in sweeps]
+    x_axis, y_axis = axes.index(x_feature), axes.index(y_feature)
+    others = tuple(a for a in range(len(sweeps)) if a not in (x_axis, y_axis))
+
+    surface = result["response"].mean(axis=others) if others else result["response"]
+    if x_axis > y_axis:
+        surface = surface.T
+
+    return pd.DataFrame(
+        surface.T,
+        index=pd.Index(sweeps[y_axis].values, name=y_feature),
+        columns=pd.Index(sweeps[x_axis].values, name=x_feature),
+    )
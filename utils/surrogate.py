@@ -0,0 +1,186 @@
+import logging
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from utils.compact_forest import export_compact_forest, load_compact_forest
+
+log = logging.getLogger(__name__)
+
+SURROGATE_PATH = "models/prediction/pred_surrogate.bin"
+SURROGATE_REPORT_PATH = "models/prediction/surrogate_report.json"
+
+PREDICTION_MODES = ("full", "surrogate")
+
+# Largest RMSE against the full model (on held-out samples) a surrogate
+# may have to be exported, about a third of the full model's own CV RMSE;
+# overridden by config.yaml distill: max_rmse
+MAX_RMSE = 0.25
+
+# Share of samples drawn around real rows; the rest are uniform over the
+# observed range of each feature
+NEAR_DATA_SHARE = 0.7
+JITTER = 0.1
+
+# name -> (estimator class, parameters)
+CANDIDATES = {
+    "forest_10x8": ("RandomForestRegressor", {"n_estimators": 10, "max_depth": 8}),
+    "forest_25x12": ("RandomForestRegressor", {"n_estimators": 25, "max_depth": 12}),
+    "boosted_100x3": ("GradientBoostingRegressor", {"n_estimators": 100, "max_depth": 3}),
+    "boosted_300x3": ("GradientBoostingRegressor", {"n_estimators": 300, "max_depth": 3}),
+}
+
+
+# ==========================
+# SAMPLING
+# ==========================
+def sample_inputs(X, n, schema=None, seed=0):
+    """Dense inputs for distillation: real rows with Gaussian jitter (JITTER
+    of each feature's range) mixed with uniform draws over the observed
+    range, clipped to the schema's plausible bounds."""
+    rng = np.random.default_rng(seed)
+    X = np.asarray(X, dtype=np.float64)
+    low, high = X.min(axis=0), X.max(axis=0)
+    spread = np.where(high > low, high - low, 1.0)
+
+    n_near = int(n * NEAR_DATA_SHARE)
+    near = X[rng.integers(0, len(X), n_near)] + rng.normal(0, JITTER, (n_near, X.shape[1])) * spread
+    uniform = rng.uniform(low, high, (n - n_near, X.shape[1]))
+    samples = np.vstack([near, uniform])
+
+    if schema is not None:
+        samples = np.clip(samples, schema.low, schema.high)
+    return samples
+
+
+# ==========================
+# DISTILL
+# ==========================
+def fit_candidate(pipeline, name, X, y, seed=0):
+    """Fit one surrogate on (X, teacher predictions y), reusing the full
+    pipeline's scaler so it exports to the same compact format."""
+    from sklearn import ensemble
+    from sklearn.pipeline import Pipeline
+
+    estimator_name, params = CANDIDATES[name]
+    scaler = pipeline.steps[0][1] if len(pipeline.steps) > 1 else None
+
+    model = getattr(ensemble, estimator_name)(random_state=seed, **params)
+    model.fit(scaler.transform(X) if scaler is not None else X, y)
+
+    steps = [("scaler", scaler)] if scaler is not None else []
+    return Pipeline(steps + [("model", model)])
+
+
+def latency_ms(model, X, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict(X)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)) * 1000
+
+
+def evaluate(model, teacher_holdout, X_holdout, teacher_real, X_real, y_real, path):
+    """Latency, size and error of a compact model against the full model."""
+    single = X_holdout[:1]
+    batch = X_holdout[:1000]
+
+    error = model.predict(X_holdout) - teacher_holdout
+    real = model.predict(X_real)
+
+    return {
+        "trees": int(model.n_trees),
+        "max_depth": int(model.max_depth),
+        "size_kb": os.path.getsize(path) / 1024,
+        "latency_1_ms": latency_ms(model, single, 200),
+        "latency_1000_ms": latency_ms(model, batch, 20),
+        "rmse_vs_full": float(np.sqrt(np.mean(error ** 2))),
+        "max_abs_vs_full": float(np.abs(error).max()),
+        "rmse_vs_full_real": float(np.sqrt(np.mean((real - teacher_real) ** 2))),
+        "rmse_vs_actual": float(np.sqrt(np.mean((real - y_real) ** 2))),
+    }
+
+
+def distill(pipeline, full_path, X_real, y_real, feature_names, schema=None,
+            n_samples=30_000, candidates=None, max_rmse=MAX_RMSE, seed=0):
+    """Fit every candidate on teacher outputs and score it through the
+    compact evaluator used for serving.
+
+    Returns (report, best): report rows include the full model; best is the
+    fitted pipeline of the fastest candidate within max_rmse, or None.
+    """
+    full = load_compact_forest(full_path)
+    X_real = np.asarray(X_real, dtype=np.float64)
+
+    samples = sample_inputs(X_real, n_samples, schema, seed)
+    teacher = full.predict(samples)
+
+    n_train = int(len(samples) * 0.8)
+    X_train, X_holdout = samples[:n_train], samples[n_train:]
+    y_train, teacher_holdout = teacher[:n_train], teacher[n_train:]
+    teacher_real = full.predict(X_real)
+
+    rows = [{
+        "model": "full",
+        **evaluate(full, teacher_holdout, X_holdout, teacher_real, X_real, y_real, full_path),
+        "meets_bound": True,
+    }]
+    fitted = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in candidates or CANDIDATES:
+            start = time.perf_counter()
+            fitted[name] = fit_candidate(pipeline, name, X_train, y_train, seed)
+            fit_s = time.perf_counter() - start
+
+            path = os.path.join(tmp, f"{name}.bin")
+            export_compact_forest(fitted[name], path, feature_names=feature_names)
+            result = evaluate(
+                load_compact_forest(path), teacher_holdout, X_holdout, teacher_real, X_real, y_real, path
+            )
+            rows.append({
+                "model": name,
+                **result,
+                "fit_s": fit_s,
+                "meets_bound": result["rmse_vs_full"] <= max_rmse,
+            })
+
+    eligible = [r for r in rows[1:] if r["meets_bound"]]
+    best = min(eligible, key=lambda r: (r["latency_1_ms"], r["size_kb"]), default=None)
+
+    for row in rows:
+        row["selected"] = best is not None and row["model"] == best["model"]
+
+    return rows, fitted[best["model"]] if best is not None else None
+
+
+# ==========================
+# SERVING
+# ==========================
+def serving_model(registry, mode="full"):
+    """(model, cache key, mode served) for prediction requests.
+
+    "surrogate" serves the distilled model when it was distilled from the
+    current pipeline and falls back to the full model otherwise. The full
+    model is served from the compact forest when it is current.
+    """
+    if mode not in PREDICTION_MODES:
+        raise ValueError(f"Unknown prediction mode {mode!r}; expected one of {PREDICTION_MODES}")
+
+    pipeline_hash = registry.content_hash("pipeline")
+
+    if mode == "surrogate":
+        surrogate = registry.try_get("surrogate")
+        if surrogate is not None and surrogate.source_hash == pipeline_hash:
+            return surrogate, registry.content_hash("surrogate"), "surrogate"
+        log.warning("Surrogate model missing or stale; serving the full model")
+
+    compact = registry.try_get("compact_forest")
+    if compact is not None and compact.source_hash == pipeline_hash:
+        return compact, pipeline_hash, "full"
+
+    model, model_hash = registry.versioned("pipeline")
+    return model, model_hash, "full"
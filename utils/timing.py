@@ -0,0 +1,119 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+
+# Opt-in: FOOD_TIMING=1 enables spans; everything below is a no-op otherwise
+ENABLED = os.environ.get("FOOD_TIMING", "") not in ("", "0")
+LOG_PATH = os.environ.get("FOOD_TIMING_LOG", "logs/timing.jsonl")
+
+# Durations kept per span name for the diagnostics histograms
+HISTORY = 500
+
+_local = threading.local()
+_history = defaultdict(lambda: deque(maxlen=HISTORY))
+_history_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+# ==========================
+# SPANS
+# ==========================
+class _NullSpan:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def span(name):
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(name)
+
+
+def timed(name=None):
+    # Decorator form of span(); returns the function untouched when disabled
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with Span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def record(name, seconds):
+    spans = getattr(_local, "spans", None)
+    if spans is not None:
+        spans.append((name, seconds))
+
+    with _history_lock:
+        _history[name].append(seconds)
+
+
+# ==========================
+# PER-RERUN LOG
+# ==========================
+def start_rerun(**fields):
+    if not ENABLED:
+        return
+    _local.spans = []
+    _local.fields = fields
+    _local.start = time.perf_counter()
+
+
+def end_rerun():
+    if not ENABLED or getattr(_local, "spans", None) is None:
+        return
+
+    entry = {
+        "ts": time.time(),
+        "rerun_id": uuid.uuid4().hex[:12],
+        **_local.fields,
+        "total_ms": (time.perf_counter() - _local.start) * 1000,
+        "spans": [{"name": n, "ms": s * 1000} for n, s in _local.spans],
+    }
+    _local.spans = None
+
+    with _log_lock:
+        os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+        with open(LOG_PATH, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def latency_history():
+    # Snapshot of recent durations in milliseconds, per span name
+    with _history_lock:
+        return {name: [s * 1000 for s in values] for name, values in _history.items()}